@@ -3,7 +3,13 @@
 # Pour gérer les données depuis /admin
 # ============================================================================
 
+import functools
+import time
+
 from django.contrib import admin
+from django.db.models import Count, Q
+from django.urls import reverse
+from django.utils import timezone
 from django.utils.html import format_html
 
 from .models import (
@@ -16,8 +22,63 @@ from .models import (
     Membre,
     SousTraitant,
     Anomalie,
+    StatusChantier,
+    StatusTache,
 )
 
+# Badges de statut pré-calculés (une seule mise en forme au chargement)
+_STATUS_HTML = {
+    code: format_html(
+        '<span style="color: {};">{}</span>',
+        color,
+        StatusChantier(code).label,
+    )
+    for code, color in (
+        (StatusChantier.EN_ATTENTE, "gray"),
+        (StatusChantier.EN_COURS, "blue"),
+        (StatusChantier.EN_PAUSE, "orange"),
+        (StatusChantier.TERMINE, "green"),
+        (StatusChantier.FACTURE, "purple"),
+        (StatusChantier.ANNULE, "red"),
+    )
+}
+
+# Date du jour partagée entre les lignes d'une liste (rafraîchie toutes les 60 s)
+_TODAY_TTL = 60
+_today_cache = {"value": None, "expire": 0.0}
+
+
+def _today():
+    """Date du jour mise en cache pour éviter timezone.now() à chaque ligne."""
+    now = time.monotonic()
+    if now >= _today_cache["expire"]:
+        _today_cache["value"] = timezone.now().date()
+        _today_cache["expire"] = now + _TODAY_TTL
+    return _today_cache["value"]
+
+
+def _row_cache(fn):
+    """
+    Mémoriser le rendu d'une colonne sur l'objet affiché.
+    Les instances étant recréées à chaque requête, le cache ne vit
+    que le temps d'un affichage de la liste.
+    """
+
+    @functools.wraps(fn)
+    def inner(self, obj):
+        cache = obj.__dict__.setdefault("_disp_cache", {})
+        if fn.__name__ not in cache:
+            cache[fn.__name__] = fn(self, obj)
+        return cache[fn.__name__]
+
+    return inner
+
+
+def _is_changelist(request):
+    """Vrai si la requête affiche la liste (pas le formulaire d'édition)."""
+    match = request.resolver_match
+    return match is not None and (match.url_name or "").endswith("_changelist")
+
 # ============================================================================
 # INLINE ADMINS - Pour les relations imbriquées
 # ============================================================================
@@ -37,6 +98,14 @@ class LotInline(admin.TabularInline):
         "status",
     ]
 
+    def get_queryset(self, request):
+        """Ne charger que les colonnes éditées dans l'inline."""
+        return (
+            super()
+            .get_queryset(request)
+            .only("chantier", *self.fields)
+        )
+
 
 class TacheInline(admin.TabularInline):
     """Éditer les tâches directement depuis le lot."""
@@ -46,15 +115,6 @@ class TacheInline(admin.TabularInline):
     fields = ["numero", "nom", "date_fin_prevue", "status", "heures_estimees"]
 
 
-class HeuresTravailInline(admin.TabularInline):
-    """Historique des heures pour une tâche."""
-
-    model = HeureTravail
-    extra = 1
-    fields = ["date", "membre", "heures", "validee"]
-    can_delete = True
-
-
 class PhotoRapportInline(admin.TabularInline):
     """Photos pour une tâche."""
 
@@ -90,6 +150,7 @@ class ChantiersAdmin(admin.ModelAdmin):
         "jours_restants_display",
     ]
     list_filter = ["status", "date_creation", "date_debut"]
+    list_select_related = ("chef",)
     search_fields = ["numero", "nom", "adresse", "ville"]
     readonly_fields = [
         "date_creation",
@@ -155,6 +216,40 @@ class ChantiersAdmin(admin.ModelAdmin):
     )
     inlines = [LotInline]
 
+    def get_queryset(self, request):
+        """
+        Charger chef et créateur en une seule requête (évite le N+1)
+        et annoter les compteurs de tâches pour la progression.
+        La liste ne charge que les colonnes affichées.
+        """
+        qs = (
+            super()
+            .get_queryset(request)
+            .annotate(
+                _total_taches=Count("lots__taches", distinct=True),
+                _taches_term=Count(
+                    "lots__taches",
+                    filter=Q(lots__taches__status=StatusTache.TERMINEE),
+                    distinct=True,
+                ),
+            )
+        )
+        if _is_changelist(request):
+            return qs.select_related("chef").only(
+                "numero",
+                "nom",
+                "status",
+                "chef",
+                "chef__first_name",
+                "chef__last_name",
+                "budget_total",
+                "cout_reel",
+                "date_fin_prevue",
+                "date_creation",
+            )
+        return qs.select_related("chef", "creé_par")
+
+    @_row_cache
     def chef_display(self, obj):
         if obj.chef:
             return f"{obj.chef.first_name} {obj.chef.last_name}"
@@ -162,26 +257,25 @@ class ChantiersAdmin(admin.ModelAdmin):
 
     chef_display.short_description = "Chef"
 
+    @_row_cache
     def status_display(self, obj):
-        colors = {
-            "EN_ATTENTE": "gray",
-            "EN_COURS": "blue",
-            "EN_PAUSE": "orange",
-            "TERMINE": "green",
-            "FACTURE": "purple",
-            "ANNULE": "red",
-        }
-        color = colors.get(obj.status, "gray")
-        return format_html(
-            '<span style="color: {};">{}</span>',
-            color,
-            obj.get_status_display(),
-        )
+        html = _STATUS_HTML.get(obj.status)
+        if html is None:
+            # Code hors StatusChantier : get_status_display() renverrait
+            # lui aussi la valeur brute
+            return format_html('<span style="color: gray;">{}</span>', obj.status)
+        return html
 
     status_display.short_description = "Statut"
 
+    @_row_cache
     def progression_display(self, obj):
-        progress = obj.get_progression_percentage()
+        # Compteurs annotés dans get_queryset : aucune requête par ligne
+        progress = (
+            obj._taches_term / obj._total_taches * 100
+            if obj._total_taches
+            else 0
+        )
         return format_html(
             '<div style="width: 100px; border: 1px solid #ccc;">'
             '<div style="width: {}%; background-color: #4CAF50; '
@@ -193,13 +287,15 @@ class ChantiersAdmin(admin.ModelAdmin):
 
     progression_display.short_description = "Progression"
 
+    @_row_cache
     def budget_display(self, obj):
         return f"{obj.cout_reel} / {obj.budget_total} €"
 
     budget_display.short_description = "Coût / Budget"
 
+    @_row_cache
     def jours_restants_display(self, obj):
-        jours = obj.get_jours_restants()
+        jours = obj.get_jours_restants(today=_today())
         if jours is None:
             return "-"
         if jours < 0:
@@ -226,15 +322,20 @@ class LotsAdmin(admin.ModelAdmin):
         "date_fin_prevue",
         "status",
     ]
-    search_fields = [
-        "titre",
-        "tache__nom",
-        "tache__lot__chantier__nom",
-    ]
-
+    list_select_related = ("chantier",)
     search_fields = ["numero", "nom", "chantier__nom"]
     inlines = [TacheInline]
 
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if _is_changelist(request):
+            return qs.defer(
+                "description",
+                "chantier__description",
+                "chantier__notes_internes",
+            )
+        return qs
+
 
 # ============================================================================
 # ADMIN : TÂCHE
@@ -261,8 +362,43 @@ class TachesAdmin(admin.ModelAdmin):
         "lot__chantier",
         "equipe",
     ]
+    list_select_related = ("lot", "lot__chantier", "equipe")
     search_fields = ["numero", "nom", "lot__chantier__nom"]
-    inlines = [HeuresTravailInline, PhotoRapportInline]
+    readonly_fields = ["heures_total_display"]
+    # Les heures ne sont plus éditées en inline : une tâche peut en compter
+    # des centaines, on renvoie vers la liste filtrée des heures
+    inlines = [PhotoRapportInline]
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if _is_changelist(request):
+            return qs.defer(
+                "description",
+                "notes",
+                "lot__description",
+                "lot__chantier__description",
+                "lot__chantier__notes_internes",
+                "equipe__description",
+            )
+        return qs
+
+    def heures_total_display(self, obj):
+        if obj.pk is None:
+            return "-"
+        url = reverse(
+            "admin:{}_{}_changelist".format(
+                HeureTravail._meta.app_label,
+                HeureTravail._meta.model_name,
+            )
+        )
+        return format_html(
+            '<a href="{}?tache__id__exact={}">{} h</a>',
+            url,
+            obj.pk,
+            obj.heures_reelles,
+        )
+
+    heures_total_display.short_description = "Heures enregistrées"
 
 
 # ============================================================================
@@ -282,6 +418,8 @@ class HeuresTravailAdmin(admin.ModelAdmin):
         "validee",
     ]
     list_filter = ["validee", "date", "membre", "tache__lot__chantier"]
+    list_select_related = ("tache", "tache__lot__chantier", "membre")
+    list_per_page = 50
     search_fields = ["tache__numero", "membre__nom", "membre__prenom"]
 
 
@@ -294,11 +432,27 @@ class HeuresTravailAdmin(admin.ModelAdmin):
 class EquipesAdmin(admin.ModelAdmin):
     """Gestion des équipes."""
 
-    list_display = ["nom", "chantier", "chef_equipe", "actif"]
+    list_display = ["nom", "chantier", "chef_equipe", "nombre_membres", "actif"]
     list_filter = ["actif", "chantier"]
     search_fields = ["nom", "chantier__nom"]
     inlines = [MembreInline]
 
+    def get_queryset(self, request):
+        """Compter les membres actifs dans la requête de la liste."""
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                _membres_count=Count("membres", filter=Q(membres__actif=True))
+            )
+        )
+
+    def nombre_membres(self, obj):
+        return obj.get_membres_count()
+
+    nombre_membres.short_description = "Membres"
+    nombre_membres.admin_order_field = "_membres_count"
+
 
 @admin.register(Membre)
 class MembresAdmin(admin.ModelAdmin):
@@ -313,6 +467,7 @@ class MembresAdmin(admin.ModelAdmin):
         "actif",
     ]
     list_filter = ["actif", "role", "equipe__chantier"]
+    list_select_related = ("equipe",)
     search_fields = ["prenom", "nom", "equipe__nom"]
 
 
@@ -365,8 +520,23 @@ class AnomaliesAdmin(admin.ModelAdmin):
         "date_creation",
         "date_resolution_prevue",
     ]
+    list_select_related = ("tache", "tache__lot__chantier", "signalee_par")
+    list_per_page = 50
+    autocomplete_fields = ["tache", "signalee_par", "responsable_correction"]
     search_fields = [
         "titre",
         "tache__nom",
         "tache__lot__chantier__nom",
     ]
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if _is_changelist(request):
+            return qs.defer(
+                "description",
+                "tache__description",
+                "tache__notes",
+                "tache__lot__chantier__description",
+                "tache__lot__chantier__notes_internes",
+            )
+        return qs
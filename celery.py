@@ -0,0 +1,20 @@
+# =================================================================
+# celery.py - Application Celery du projet (config/celery.py)
+# Broker, routes et planification : réglages CELERY_* de settings.py
+# Worker : celery -A config worker -Q celery,photos
+# Planificateur : celery -A config beat
+# =================================================================
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+app = Celery('config')
+
+# Tous les réglages CELERY_* de settings.py (CELERY_BROKER_URL, ...)
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+# Charge les modules tasks.py des applications installées
+app.autodiscover_tasks()
@@ -0,0 +1,23 @@
+# =================================================================
+# conftest.py - Fixtures pytest partagées
+# =================================================================
+
+import pytest
+from django.contrib.auth.models import User
+
+
+@pytest.fixture(scope='session')
+def api_client_auth(django_db_setup, django_db_blocker):
+    """
+    Client authentifié, créé une seule fois pour toute la session.
+    L'utilisateur est écrit hors des transactions de test : il n'est
+    pas annulé entre deux tests (get_or_create pour --reuse-db).
+    """
+    from rest_framework.test import APIClient
+
+    with django_db_blocker.unblock():
+        user, _ = User.objects.get_or_create(username='api-client')
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
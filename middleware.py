@@ -0,0 +1,49 @@
+# =================================================================
+# middleware.py - Middlewares de l'API
+# Contrôles effectués avant que Django ne lise le corps de la requête
+# =================================================================
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils import timezone
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Refuse (413) les envois multipart dont le Content-Length dépasse
+    MAX_UPLOAD_SIZE, avant toute lecture du corps : aucun fichier
+    temporaire ni UploadedFile n'est créé pour un envoi hors limite.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.max_size = settings.MAX_UPLOAD_SIZE
+
+    def __call__(self, request):
+        if request.content_type == 'multipart/form-data':
+            try:
+                length = int(request.META.get('CONTENT_LENGTH') or 0)
+            except ValueError:
+                length = 0
+
+            if length > self.max_size:
+                return JsonResponse(
+                    {'detail': "Fichier trop volumineux."},
+                    status=413
+                )
+
+        return self.get_response(request)
+
+
+class RequestClockMiddleware:
+    """
+    Lit l'horloge une seule fois par requête (request._now) : vues et
+    serializers partagent la même date du jour, même en fin de journée.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request._now = timezone.now()
+        return self.get_response(request)
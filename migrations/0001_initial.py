@@ -0,0 +1,266 @@
+# Generated by Django 4.2.27 on 2026-10-14 12:49
+
+from decimal import Decimal
+from django.conf import settings
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Chantier',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('numero', models.CharField(help_text='Numéro unique du chantier (ex: CH-2024-001)', max_length=50, unique=True)),
+                ('nom', models.CharField(help_text='Nom/description du chantier', max_length=200)),
+                ('adresse', models.CharField(help_text='Adresse complète du chantier', max_length=255)),
+                ('codepostal', models.CharField(max_length=10)),
+                ('ville', models.CharField(max_length=100)),
+                ('latitude', models.FloatField(blank=True, help_text='GPS latitude', null=True)),
+                ('longitude', models.FloatField(blank=True, help_text='GPS longitude', null=True)),
+                ('date_debut', models.DateField()),
+                ('date_fin_prevue', models.DateField()),
+                ('date_fin_reelle', models.DateField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('EN_ATTENTE', 'En attente'), ('EN_COURS', 'En cours'), ('EN_PAUSE', 'En pause'), ('TERMINE', 'Terminé'), ('FACTURE', 'Facturé'), ('ANNULE', 'Annulé')], default='EN_ATTENTE', max_length=20)),
+                ('budget_total', models.DecimalField(decimal_places=2, max_digits=12, validators=[django.core.validators.MinValueValidator(Decimal('0'))])),
+                ('cout_reel', models.DecimalField(decimal_places=2, default=0, help_text='Calculé automatiquement', max_digits=12, validators=[django.core.validators.MinValueValidator(Decimal('0'))])),
+                ('description', models.TextField(blank=True)),
+                ('notes_internes', models.TextField(blank=True, help_text='Notes non visibles au client')),
+                ('date_creation', models.DateTimeField(auto_now_add=True)),
+                ('date_modification', models.DateTimeField(auto_now=True)),
+                ('actif', models.BooleanField(default=True)),
+                ('chef', models.ForeignKey(help_text='Chef responsable du chantier', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='chantiers_diriges', to=settings.AUTH_USER_MODEL)),
+                ('creé_par', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='chantiers_crees', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Chantiers',
+                'ordering': ['-date_creation'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Equipe',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nom', models.CharField(max_length=100)),
+                ('description', models.TextField(blank=True)),
+                ('specialite', models.CharField(choices=[('COUVERTURE', 'Couverture'), ('PLOMBERIE', 'Plomberie'), ('ELECTRICITE', 'Électricité'), ('MENUISERIE', 'Menuiserie'), ('PEINTURE', 'Peinture'), ('CARRELAGE', 'Carrelage'), ('CLOISONS', 'Cloisons/Isolation'), ('MACONNERIE', 'Maçonnerie'), ('EXCAVATION', 'Excavation/Terrassement'), ('AUTRE', 'Autre')], help_text='Domaine de compétence', max_length=50)),
+                ('contrat_externe', models.BooleanField(default=False, help_text='Équipe sous-contractée ?')),
+                ('actif', models.BooleanField(default=True)),
+                ('date_creation', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['nom'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Lot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nom', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('numero', models.PositiveIntegerField(help_text="Numéro d'ordre (1, 2, 3...)")),
+                ('date_debut_prevue', models.DateField()),
+                ('date_fin_prevue', models.DateField()),
+                ('budget_lot', models.DecimalField(decimal_places=2, help_text='Budget alloué à ce lot', max_digits=12, validators=[django.core.validators.MinValueValidator(Decimal('0'))])),
+                ('status', models.CharField(choices=[('EN_ATTENTE', 'En attente'), ('EN_COURS', 'En cours'), ('EN_PAUSE', 'En pause'), ('TERMINE', 'Terminé'), ('FACTURE', 'Facturé'), ('ANNULE', 'Annulé')], default='EN_ATTENTE', max_length=20)),
+                ('date_creation', models.DateTimeField(auto_now_add=True)),
+                ('date_modification', models.DateTimeField(auto_now=True)),
+                ('chantier', models.ForeignKey(help_text='Chantier parent', on_delete=django.db.models.deletion.CASCADE, related_name='lots', to='chantiers.chantier')),
+                ('responsable', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='lots_diriges', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Lots',
+                'ordering': ['chantier', 'numero'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SousTraitant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nom_entreprise', models.CharField(max_length=200)),
+                ('nom_contact', models.CharField(blank=True, max_length=200)),
+                ('email', models.EmailField(max_length=254)),
+                ('telephone', models.CharField(max_length=20)),
+                ('adresse', models.CharField(blank=True, max_length=255)),
+                ('codepostal', models.CharField(blank=True, max_length=10)),
+                ('ville', models.CharField(blank=True, max_length=100)),
+                ('specialites', models.CharField(help_text='Domaine principal de compétence', max_length=255)),
+                ('taux_horaire', models.DecimalField(decimal_places=2, max_digits=8, validators=[django.core.validators.MinValueValidator(Decimal('0'))])),
+                ('conditions_paiement', models.CharField(blank=True, help_text='Ex: 30 jours, 50% acompte...', max_length=100)),
+                ('reference_client', models.CharField(blank=True, help_text='Numéro client/fournisseur interne', max_length=50)),
+                ('actif', models.BooleanField(default=True)),
+                ('note_moyenne', models.DecimalField(decimal_places=2, default=5.0, help_text='Note moyenne de qualité (0-5)', max_digits=3, validators=[django.core.validators.MinValueValidator(Decimal('0')), django.core.validators.MaxValueValidator(Decimal('5'))])),
+                ('notes', models.TextField(blank=True, help_text='Notes internes')),
+                ('date_creation', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Sous-traitants',
+                'ordering': ['nom_entreprise'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Tache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('numero', models.CharField(help_text='Numéro de tâche (T-001, T-002...)', max_length=50)),
+                ('nom', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('ordre', models.PositiveIntegerField(default=0, help_text="Ordre d'exécution")),
+                ('date_debut_prevue', models.DateField()),
+                ('date_fin_prevue', models.DateField()),
+                ('date_debut_reelle', models.DateField(blank=True, null=True)),
+                ('date_fin_reelle', models.DateField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('A_FAIRE', 'À faire'), ('EN_COURS', 'En cours'), ('EN_ATTENTE', 'En attente (bloqué)'), ('TERMINEE', 'Terminée'), ('REVISEE', 'Révisée')], default='A_FAIRE', max_length=20)),
+                ('heures_estimees', models.DecimalField(decimal_places=1, max_digits=8, validators=[django.core.validators.MinValueValidator(Decimal('0'))])),
+                ('heures_reelles', models.DecimalField(decimal_places=1, default=0, editable=False, help_text='Somme des heures enregistrées', max_digits=8)),
+                ('taux_horaire', models.DecimalField(decimal_places=2, default=50, help_text="Taux horaire moyen de l'équipe", max_digits=8, validators=[django.core.validators.MinValueValidator(Decimal('0'))])),
+                ('notes', models.TextField(blank=True)),
+                ('date_creation', models.DateTimeField(auto_now_add=True)),
+                ('date_modification', models.DateTimeField(auto_now=True)),
+                ('bloquee_par', models.ManyToManyField(blank=True, help_text='Tâches qui bloquent celle-ci', related_name='bloque', to='chantiers.tache')),
+                ('equipe', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='taches', to='chantiers.equipe')),
+                ('lot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='taches', to='chantiers.lot')),
+                ('sous_traitants', models.ManyToManyField(blank=True, help_text='Sous-traitants impliqués', related_name='taches', to='chantiers.soustraitant')),
+            ],
+            options={
+                'ordering': ['lot', 'ordre'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PhotoRapport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('titre', models.CharField(blank=True, max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('image', models.ImageField(help_text='Format : JPG, PNG, WebP. Max 5MB', upload_to='chantiers/photos/%Y/%m/%d/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'webp'])])),
+                ('latitude', models.FloatField(blank=True, help_text='GPS latitude', null=True)),
+                ('longitude', models.FloatField(blank=True, help_text='GPS longitude', null=True)),
+                ('date_photo', models.DateTimeField(default=django.utils.timezone.now)),
+                ('approuvee', models.BooleanField(default=False)),
+                ('date_upload', models.DateTimeField(auto_now_add=True)),
+                ('approuvee_par', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='photos_approuvees', to=settings.AUTH_USER_MODEL)),
+                ('tache', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='photos', to='chantiers.tache')),
+                ('uploadée_par', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='photos_uploadees', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-date_photo'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Membre',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prenom', models.CharField(max_length=100)),
+                ('nom', models.CharField(max_length=100)),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('telephone', models.CharField(blank=True, max_length=20)),
+                ('role', models.CharField(choices=[('CHEF', 'Chef de chantier'), ('CHEF_EQUIPE', "Chef d'équipe"), ('OUVRIER', 'Ouvrier'), ('APPRENTI', 'Apprenti'), ('AUTRE', 'Autre')], default='OUVRIER', max_length=20)),
+                ('qualifications', models.CharField(blank=True, help_text='Certifications, habilitations (virgule-séparé)', max_length=255)),
+                ('taux_horaire', models.DecimalField(decimal_places=2, default=50, max_digits=8, validators=[django.core.validators.MinValueValidator(Decimal('0'))])),
+                ('actif', models.BooleanField(default=True)),
+                ('date_embauche', models.DateField()),
+                ('date_creation', models.DateTimeField(auto_now_add=True)),
+                ('equipe', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='membres', to='chantiers.equipe')),
+                ('user', models.OneToOneField(blank=True, help_text='Compte utilisateur Django (optionnel)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='membre_profil', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['nom', 'prenom'],
+            },
+        ),
+        migrations.CreateModel(
+            name='HeureTravail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(default=django.utils.timezone.now)),
+                ('heures', models.DecimalField(decimal_places=2, max_digits=5, validators=[django.core.validators.MinValueValidator(Decimal('0')), django.core.validators.MaxValueValidator(Decimal('24'))])),
+                ('description', models.CharField(blank=True, help_text='Travaux effectués (optionnel)', max_length=255)),
+                ('latitude', models.FloatField(blank=True, null=True)),
+                ('longitude', models.FloatField(blank=True, null=True)),
+                ('validee', models.BooleanField(default=False, help_text='Validée par le chef')),
+                ('date_enregistrement', models.DateTimeField(auto_now_add=True)),
+                ('date_modification', models.DateTimeField(auto_now=True)),
+                ('membre', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='heures_travail', to='chantiers.membre')),
+                ('tache', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='heures_travail', to='chantiers.tache')),
+                ('validee_par', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='heures_validees', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.AddField(
+            model_name='equipe',
+            name='chef',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='equipe_chef', to='chantiers.membre'),
+        ),
+        migrations.CreateModel(
+            name='Anomalie',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('titre', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('severite', models.CharField(choices=[('CRITIQUE', 'Critique (arrêt du chantier)'), ('MAJEURE', 'Majeure (impact important)'), ('MINEURE', 'Mineure (corrigible rapidement)')], max_length=10)),
+                ('statut', models.CharField(choices=[('OUVERTE', 'Ouverte'), ('EN_COURS', 'En cours de correction'), ('FERMEE', 'Fermée'), ('REPORTEE', 'Reportée')], default='OUVERTE', max_length=20)),
+                ('date_resolution_prevue', models.DateField(blank=True, null=True)),
+                ('date_resolution_reelle', models.DateField(blank=True, null=True)),
+                ('date_creation', models.DateTimeField(auto_now_add=True)),
+                ('date_modification', models.DateTimeField(auto_now=True)),
+                ('photo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='anomalies', to='chantiers.photorapport')),
+                ('responsable_correction', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='anomalies_a_corriger', to=settings.AUTH_USER_MODEL)),
+                ('signalee_par', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='anomalies_signalees', to=settings.AUTH_USER_MODEL)),
+                ('tache', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='anomalies', to='chantiers.tache')),
+            ],
+            options={
+                'ordering': ['-date_creation'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='tache',
+            index=models.Index(fields=['status'], name='chantiers_t_status_56dbcb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tache',
+            index=models.Index(fields=['lot', 'status'], name='chantiers_t_lot_id_e155f9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='photorapport',
+            index=models.Index(fields=['tache', 'date_photo'], name='chantiers_p_tache_i_7fec07_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membre',
+            index=models.Index(fields=['equipe', 'actif'], name='chantiers_m_equipe__69844b_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='lot',
+            unique_together={('chantier', 'numero')},
+        ),
+        migrations.AddIndex(
+            model_name='heuretravail',
+            index=models.Index(fields=['tache', 'date'], name='chantiers_h_tache_i_ca1e8c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='heuretravail',
+            index=models.Index(fields=['membre', 'date'], name='chantiers_h_membre__b9d592_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chantier',
+            index=models.Index(fields=['numero'], name='chantiers_c_numero_6c2cb7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chantier',
+            index=models.Index(fields=['status'], name='chantiers_c_status_372094_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chantier',
+            index=models.Index(fields=['date_debut'], name='chantiers_c_date_de_e3f405_idx'),
+        ),
+    ]
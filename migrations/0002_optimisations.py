@@ -0,0 +1,52 @@
+# Generated by Django 4.2.27 on 2026-10-14 12:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chantiers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='photorapport',
+            name='date_modification',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='photorapport',
+            name='miniature',
+            field=models.ImageField(blank=True, help_text='Générée en tâche de fond (320px)', upload_to='chantiers/photos/miniatures/%Y/%m/%d/'),
+        ),
+        migrations.AddField(
+            model_name='photorapport',
+            name='traitee',
+            field=models.BooleanField(default=False, help_text='EXIF retiré et miniature générée par le worker'),
+        ),
+        migrations.AddIndex(
+            model_name='anomalie',
+            index=models.Index(fields=['tache', 'severite', 'statut'], name='chantiers_a_tache_i_f02967_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chantier',
+            index=models.Index(fields=['status', 'date_fin_prevue'], name='chantiers_c_status_bda251_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='heuretravail',
+            index=models.Index(fields=['tache', 'validee', 'date'], name='chantiers_h_tache_i_cfe9e1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='heuretravail',
+            index=models.Index(fields=['date'], name='chantiers_h_date_ef976f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lot',
+            index=models.Index(fields=['chantier', 'status'], name='chantiers_l_chantie_66ee74_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tache',
+            index=models.Index(fields=['date_fin_prevue'], name='chantiers_t_date_fi_a8b53f_idx'),
+        ),
+    ]
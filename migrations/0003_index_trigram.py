@@ -0,0 +1,81 @@
+# =================================================================
+# Index trigram (pg_trgm) de la recherche ?search= (PostgreSQL)
+# Hors Meta.indexes : l'état des modèles, donc makemigrations, reste
+# identique quel que soit le moteur ; sur SQLite la migration ne fait rien
+# =================================================================
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+from django.db.models.functions import Upper
+
+# Champs de SearchFilter (search_fields des vues) par modèle
+INDEX_TRIGRAM = {
+    'chantier': [
+        ('numero', 'chantier_numero_trgm'),
+        ('nom', 'chantier_nom_trgm'),
+        ('adresse', 'chantier_adresse_trgm'),
+        ('ville', 'chantier_ville_trgm'),
+    ],
+    'tache': [
+        ('numero', 'tache_numero_trgm'),
+        ('nom', 'tache_nom_trgm'),
+        ('description', 'tache_description_trgm'),
+    ],
+}
+
+
+def index_trigram(champ, name):
+    """
+    Index GIN pg_trgm sur UPPER(champ) : Django traduit icontains en
+    UPPER(champ) LIKE UPPER('%...%'), que cet index sert sans scan.
+    """
+    return GinIndex(OpClass(Upper(champ), name='gin_trgm_ops'), name=name)
+
+
+def appliquer(apps, schema_editor, operation):
+    """schema_editor.<operation>(modele, index) pour chaque index."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for nom_modele, champs in INDEX_TRIGRAM.items():
+        modele = apps.get_model('chantiers', nom_modele)
+        for champ, nom in champs:
+            getattr(schema_editor, operation)(
+                modele, index_trigram(champ, nom)
+            )
+
+
+class ExtensionTrigram(TrigramExtension):
+    """
+    TrigramExtension dont le retour arrière est lui aussi sans effet
+    hors PostgreSQL (Django interroge pg_extension sans tester le moteur).
+    """
+
+    def database_backwards(self, app_label, schema_editor, from_state,
+                           to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        super().database_backwards(
+            app_label, schema_editor, from_state, to_state
+        )
+
+
+def creer_index(apps, schema_editor):
+    appliquer(apps, schema_editor, 'add_index')
+
+
+def supprimer_index(apps, schema_editor):
+    appliquer(apps, schema_editor, 'remove_index')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chantiers', '0002_optimisations'),
+    ]
+
+    operations = [
+        # CREATE EXTENSION pg_trgm (sans effet hors PostgreSQL)
+        ExtensionTrigram(),
+        migrations.RunPython(creer_index, supprimer_index),
+    ]
@@ -6,7 +6,9 @@
 from decimal import Decimal
 import logging
 
-from django.db import models
+from dateutil.relativedelta import relativedelta
+
+from django.db import models, transaction
 from django.core.validators import (
     MinValueValidator,
     MaxValueValidator,
@@ -14,7 +16,19 @@ from django.core.validators import (
 )
 from django.contrib.auth.models import User
 from django.utils import timezone
-from django.db.models import Sum
+from django.utils.functional import cached_property
+from django.db.models import (
+    Count,
+    ExpressionWrapper,
+    F,
+    Max,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value
+)
+from django.db.models.functions import Coalesce
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
@@ -72,6 +86,28 @@ class TypeSousTraitant(models.TextChoices):
     AUTRE = 'AUTRE', 'Autre'
 
 
+# =================================================================
+# UTILITAIRES
+# =================================================================
+
+
+def get_bornes_mois(today=None):
+    """
+    Intervalle semi-ouvert [1er du mois, 1er du mois suivant) du mois
+    de `today` (aujourd'hui par défaut) : filtrer avec date__gte/date__lt.
+    """
+    debut_mois = (today or timezone.now().date()).replace(day=1)
+    return debut_mois, debut_mois + relativedelta(months=1)
+
+
+def cout_heures_expression():
+    """Expression SQL heures_reelles × taux_horaire d'une tâche."""
+    return ExpressionWrapper(
+        F('heures_reelles') * F('taux_horaire'),
+        output_field=models.DecimalField(max_digits=12, decimal_places=2)
+    )
+
+
 # =================================================================
 # MODEL : CHANTIER (Projet principal)
 # =================================================================
@@ -172,42 +208,121 @@ class Chantier(models.Model):
             models.Index(fields=['numero']),
             models.Index(fields=['status']),
             models.Index(fields=['date_debut']),
+            models.Index(fields=['status', 'date_fin_prevue']),
+            # Index trigram de la recherche ?search= : migration
+            # 0003_index_trigram (PostgreSQL uniquement)
         ]
         verbose_name_plural = 'Chantiers'
 
     def __str__(self):
         return f"{self.numero} - {self.nom}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Invalider la progression mise en cache sur l'instance
+        try:
+            del self.progression_pct
+        except AttributeError:
+            pass
+
+    @cached_property
+    def progression_pct(self):
+        """% d'avancement, calculé une seule fois par instance."""
+        return self.get_progression_percentage()
+
     def get_progression_percentage(self):
-        """Calcule le % d'avancement du chantier."""
-        lots = self.lots.all()
-        if not lots.exists():
-            return 0
+        """
+        Calcule le % d'avancement du chantier.
+        Utilise les compteurs annotés par la vue si présents, sinon un agrégat.
+        """
+        total = getattr(self, '_nombre_taches', None)
+        terminees = getattr(self, '_taches_terminees', None)
+        if total is None or terminees is None:
+            agg = Tache.objects.filter(lot__chantier_id=self.id).aggregate(
+                total=Count('pk'),
+                done=Count('pk', filter=Q(status=StatusTache.TERMINEE))
+            )
+            total, terminees = agg['total'], agg['done']
 
-        total_taches = sum(lot.taches.count() for lot in lots)
-        if total_taches == 0:
+        if not total:
             return 0
-
-        taches_terminees = sum(
-            lot.taches.filter(status=StatusTache.TERMINEE).count()
-            for lot in lots
-        )
-        return (taches_terminees / total_taches) * 100
+        return (terminees / total) * 100
 
     def calculer_cout_reel(self):
         """Recalcule le coût réel basé sur les heures travaillées."""
-        total = Decimal('0')
-        for lot in self.lots.all():
-            for tache in lot.taches.all():
-                total += tache.calculer_cout_heures()
+        # Une seule requête agrégée au lieu d'une boucle lots > tâches
+        total = Tache.objects.filter(lot__chantier=self).aggregate(
+            total=Sum(cout_heures_expression())
+        )['total'] or Decimal('0')
 
         self.cout_reel = total
-        self.save(update_fields=['cout_reel'])
+        self.save(update_fields=['cout_reel', 'date_modification'])
         return total
 
-    def get_jours_restants(self):
-        """Nombre de jours avant la fin prévue."""
-        delta = self.date_fin_prevue - timezone.now().date()
+    @classmethod
+    def recalculer_couts_reels(cls, chantier_ids):
+        """
+        Recalcule cout_reel de plusieurs chantiers en un seul UPDATE
+        (sous-requête corrélée sur les tâches de chaque chantier).
+        """
+        couts = Tache.objects.filter(
+            lot__chantier=OuterRef('pk')
+        ).values('lot__chantier').annotate(
+            total=Sum(cout_heures_expression())
+        ).values('total')
+
+        # update() ne déclenche pas auto_now : date_modification explicite
+        # (elle sert de version au cache du rapport)
+        return cls.objects.filter(pk__in=chantier_ids).update(
+            cout_reel=Coalesce(
+                Subquery(couts),
+                Value(Decimal('0')),
+                output_field=models.DecimalField(
+                    max_digits=12,
+                    decimal_places=2
+                )
+            ),
+            date_modification=timezone.now()
+        )
+
+    def get_version_rapport(self):
+        """
+        Dernière modification du chantier, de ses lots, tâches et anomalies
+        (une requête) : sert de version à la clé de cache du rapport.
+        """
+        def derniere_modif(queryset):
+            return Subquery(
+                queryset.order_by('-date_modification').values(
+                    'date_modification'
+                )[:1]
+            )
+
+        dates = Chantier.objects.filter(pk=self.pk).annotate(
+            _v_lots=derniere_modif(
+                Lot.objects.filter(chantier=OuterRef('pk'))
+            ),
+            _v_taches=derniere_modif(
+                Tache.objects.filter(lot__chantier=OuterRef('pk'))
+            ),
+            _v_anomalies=derniere_modif(
+                Anomalie.objects.filter(tache__lot__chantier=OuterRef('pk'))
+            )
+        ).values_list(
+            'date_modification', '_v_lots', '_v_taches', '_v_anomalies'
+        ).get()
+        return max(date for date in dates if date is not None).timestamp()
+
+    def get_jours_restants(self, today=None):
+        """
+        Nombre de jours avant la fin prévue.
+        Utilise l'écart annoté par la vue si présent ; `today` permet
+        sinon de réutiliser une date déjà calculée.
+        """
+        delta = getattr(self, '_jours_restants', None)
+        if delta is None:
+            if today is None:
+                today = timezone.now().date()
+            delta = self.date_fin_prevue - today
         return delta.days if delta.days >= 0 else 0
 
 
@@ -270,19 +385,40 @@ class Lot(models.Model):
     class Meta:
         ordering = ['chantier', 'numero']
         unique_together = ['chantier', 'numero']
+        indexes = [
+            models.Index(fields=['chantier', 'status']),
+        ]
         verbose_name_plural = 'Lots'
 
     def __str__(self):
         return f"{self.chantier.numero} - Lot {self.numero}: {self.nom}"
 
     def get_progression_percentage(self):
-        """% d'avancement du lot."""
-        taches = self.taches.all()
-        if not taches.exists():
+        """
+        % d'avancement du lot.
+        Utilise, dans l'ordre : les compteurs annotés, les tâches préchargées,
+        sinon un seul agrégat.
+        """
+        total = getattr(self, '_nombre_taches', None)
+        terminees = getattr(self, '_taches_terminees', None)
+        if total is None or terminees is None:
+            if 'taches' in getattr(self, '_prefetched_objects_cache', {}):
+                taches = self.taches.all()
+                total = len(taches)
+                terminees = sum(
+                    1 for tache in taches
+                    if tache.status == StatusTache.TERMINEE
+                )
+            else:
+                agg = self.taches.aggregate(
+                    total=Count('id'),
+                    done=Count('id', filter=Q(status=StatusTache.TERMINEE))
+                )
+                total, terminees = agg['total'], agg['done']
+
+        if not total:
             return 0
-
-        terminees = taches.filter(status=StatusTache.TERMINEE).count()
-        return (terminees / taches.count()) * 100
+        return (terminees / total) * 100
 
 
 # =================================================================
@@ -385,6 +521,9 @@ class Tache(models.Model):
         indexes = [
             models.Index(fields=['status']),
             models.Index(fields=['lot', 'status']),
+            # Pagination par curseur du listing
+            models.Index(fields=['date_fin_prevue']),
+            # Index trigram de la recherche : migration 0003_index_trigram
         ]
 
     def __str__(self):
@@ -402,18 +541,39 @@ class Tache(models.Model):
         self.heures_reelles = Decimal(str(total))
         self.save(update_fields=['heures_reelles'])
 
-        # Recalculer le coût du chantier parent
-        self.lot.chantier.calculer_cout_reel()
+        # Recalculer le coût du chantier parent (un UPDATE, sans charger
+        # le lot ni le chantier)
+        Chantier.recalculer_couts_reels(
+            Lot.objects.filter(pk=self.lot_id).values('chantier_id')
+        )
         return self.heures_reelles
 
-    def est_en_retard(self):
-        """Vérifie si la tâche est en retard."""
+    def get_version_liste(self, relation):
+        """
+        Version d'une liste rattachée à la tâche (photos, anomalies,
+        heures_travail) : nombre de lignes et dernière modification, en
+        une requête. Un ajout, une modification ou une suppression la
+        change ; sert d'ETag aux actions de la vue.
+        """
+        valeurs = getattr(self, relation).aggregate(
+            nombre=Count('pk'),
+            derniere=Max('date_modification')
+        )
+        derniere = valeurs['derniere']
+        horodatage = derniere.timestamp() if derniere else 0
+        return f"{valeurs['nombre']}-{horodatage}"
+
+    def est_en_retard(self, today=None):
+        """
+        Vérifie si la tâche est en retard.
+        `today` peut être fourni pour éviter de recalculer la date par ligne.
+        """
         if self.status == StatusTache.TERMINEE:
             if (self.date_fin_reelle and
                     self.date_fin_reelle > self.date_fin_prevue):
                 return True
         else:
-            if timezone.now().date() > self.date_fin_prevue:
+            if (today or timezone.now().date()) > self.date_fin_prevue:
                 return True
         return False
 
@@ -480,6 +640,9 @@ class HeureTravail(models.Model):
         indexes = [
             models.Index(fields=['tache', 'date']),
             models.Index(fields=['membre', 'date']),
+            models.Index(fields=['tache', 'validee', 'date']),
+            # Pagination par curseur du listing
+            models.Index(fields=['date']),
         ]
 
     def __str__(self):
@@ -489,15 +652,130 @@ class HeureTravail(models.Model):
         )
 
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        # Mettre à jour le total des heures de la tâche
-        self.tache.calculer_heures_reelles()
+        # Lecture de l'ancienne valeur, écriture et recalcul des totaux
+        # dans une même transaction : pas de mise à jour perdue entre
+        # deux synchros mobiles concurrentes
+        with transaction.atomic():
+            ancien = None
+            if self.pk:
+                ancien = type(self).objects.select_for_update().filter(
+                    pk=self.pk
+                ).values('tache_id', 'heures').first()
+            super().save(*args, **kwargs)
+
+            # Recalculer seulement les tâches dont le total a changé
+            heures = Decimal(str(self.heures))
+            deltas = {self.tache_id: heures}
+            if ancien:
+                deltas[ancien['tache_id']] = (
+                    deltas.get(ancien['tache_id'], 0) - ancien['heures']
+                )
+            self._recalculer_heures(
+                [pk for pk, delta in deltas.items() if delta]
+            )
 
     def delete(self, *args, **kwargs):
-        tache = self.tache
-        super().delete(*args, **kwargs)
-        # Mettre à jour après suppression
-        tache.calculer_heures_reelles()
+        tache_id = self.tache_id
+        with transaction.atomic():
+            super().delete(*args, **kwargs)
+            # Mettre à jour après suppression
+            self._recalculer_heures([tache_id])
+
+    @classmethod
+    def bulk_ingest(cls, entrees):
+        """
+        Enregistre un lot d'heures (synchro mobile) en une seule passe :
+        un bulk_create, un SUM groupé par tâche et un bulk_update,
+        quel que soit le nombre d'entrées.
+        """
+        with transaction.atomic():
+            entrees = cls.objects.bulk_create(entrees)
+            tache_ids = {entree.tache_id for entree in entrees}
+
+            # Mêmes verrous, dans le même ordre, que _recalculer_heures :
+            # une save() concurrente attend la fin du lot, ou son écart
+            # est déjà compté dans le SUM ci-dessous
+            list(
+                Tache.objects.select_for_update()
+                .filter(pk__in=tache_ids)
+                .order_by('pk')
+                .values_list('pk', flat=True)
+            )
+            totaux = dict(
+                cls.objects.filter(tache_id__in=tache_ids)
+                .values('tache_id')
+                .annotate(total=Sum('heures'))
+                .values_list('tache_id', 'total')
+            )
+            Tache.objects.bulk_update(
+                [
+                    Tache(
+                        pk=pk,
+                        heures_reelles=Decimal(str(totaux.get(pk) or 0))
+                    )
+                    for pk in tache_ids
+                ],
+                ['heures_reelles']
+            )
+
+            chantier_ids = list(
+                Chantier.objects.select_for_update().filter(
+                    pk__in=Lot.objects.filter(
+                        taches__in=tache_ids
+                    ).values('chantier_id')
+                ).order_by('pk').values_list('pk', flat=True)
+            )
+            Chantier.recalculer_couts_reels(chantier_ids)
+
+        return entrees
+
+    def _recalculer_heures(self, tache_ids):
+        """
+        Recalcule Tache.heures_reelles des tâches verrouillées (SUM des
+        heures, un seul UPDATE), puis le coût des chantiers concernés.
+        Pas d'écart F() + delta : heures (2 décimales) serait arrondi
+        à chaque écriture sur heures_reelles (1 décimale), et les
+        arrondis s'accumuleraient.
+        Doit être appelée dans une transaction (verrous select_for_update).
+        """
+        if not tache_ids:
+            return
+
+        # Verrouiller les tâches dans un ordre stable (pas d'interblocage)
+        list(
+            Tache.objects.select_for_update()
+            .filter(pk__in=tache_ids)
+            .order_by('pk')
+            .values_list('pk', flat=True)
+        )
+        totaux = HeureTravail.objects.filter(
+            tache=OuterRef('pk')
+        ).values('tache').annotate(total=Sum('heures')).values('total')
+        Tache.objects.filter(pk__in=tache_ids).update(
+            heures_reelles=Coalesce(
+                Subquery(totaux),
+                Value(Decimal('0')),
+                output_field=models.DecimalField(
+                    max_digits=8,
+                    decimal_places=1
+                )
+            )
+        )
+
+        # La tâche en mémoire ne voit pas l'UPDATE SQL
+        if self._meta.get_field('tache').is_cached(self):
+            self.tache.refresh_from_db(fields=['heures_reelles'])
+
+        # Verrou sur les chantiers avant le recalcul : l'UPDATE qui suit
+        # voit ainsi les heures déjà validées par les autres écritures
+        chantier_ids = list(
+            Chantier.objects.select_for_update().filter(
+                pk__in=Lot.objects.filter(
+                    taches__in=tache_ids
+                ).values('chantier_id')
+            ).order_by('pk').values_list('pk', flat=True)
+        )
+        Chantier.recalculer_couts_reels(chantier_ids)
 
 
 # =================================================================
@@ -530,6 +808,15 @@ class PhotoRapport(models.Model):
         ],
         help_text="Format : JPG, PNG, WebP. Max 5MB"
     )
+    miniature = models.ImageField(
+        upload_to='chantiers/photos/miniatures/%Y/%m/%d/',
+        blank=True,
+        help_text="Générée en tâche de fond (320px)"
+    )
+    traitee = models.BooleanField(
+        default=False,
+        help_text="EXIF retiré et miniature générée par le worker"
+    )
 
     # Métadonnées photo
     latitude = models.FloatField(
@@ -562,6 +849,7 @@ class PhotoRapport(models.Model):
         related_name='photos_uploadees'
     )
     date_upload = models.DateTimeField(auto_now_add=True)
+    date_modification = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-date_photo']
@@ -622,8 +910,11 @@ class Equipe(models.Model):
         return f"{self.nom} ({self.specialite})"
 
     def get_membres_count(self):
-        """Nombre de membres dans l'équipe."""
-        return self.membres.filter(actif=True).count()
+        """Nombre de membres actifs (annoté par la vue si possible)."""
+        count = getattr(self, '_membres_count', None)
+        if count is None:
+            count = self.membres.filter(actif=True).count()
+        return count
 
 
 # =================================================================
@@ -695,19 +986,18 @@ class Membre(models.Model):
         return f"{self.prenom} {self.nom} ({self.role})"
 
     def get_heures_ce_mois(self):
-        """Heures travaillées ce mois-ci."""
-        from dateutil.relativedelta import relativedelta
-
-        debut_mois = timezone.now().replace(day=1)
-        fin_mois = (
-            debut_mois +
-            relativedelta(months=1) -
-            relativedelta(days=1)
-        )
-
+        """
+        Heures travaillées ce mois-ci.
+        Utilise `_heures_mois` si la vue l'a annoté.
+        """
+        heures = getattr(self, '_heures_mois', None)
+        if heures is not None:
+            return Decimal(str(heures))
+
+        debut_mois, mois_suivant = get_bornes_mois()
         total = self.heures_travail.filter(
             date__gte=debut_mois,
-            date__lte=fin_mois
+            date__lt=mois_suivant
         ).aggregate(Sum('heures'))['heures__sum'] or 0
 
         return Decimal(str(total))
@@ -858,14 +1148,18 @@ class Anomalie(models.Model):
 
     class Meta:
         ordering = ['-date_creation']
+        indexes = [
+            models.Index(fields=['tache', 'severite', 'statut']),
+        ]
 
     def __str__(self):
         return f"[{self.severite}] {self.titre}"
 
-    def est_en_retard(self):
+    def est_en_retard(self, today=None):
         """Vérifie si la correction est en retard."""
         if self.statut != 'FERMEE' and self.date_resolution_prevue:
-            return timezone.now().date() > self.date_resolution_prevue
+            today = today or timezone.now().date()
+            return today > self.date_resolution_prevue
         return False
 
 
@@ -875,18 +1169,12 @@ class Anomalie(models.Model):
 # =================================================================
 
 
-@receiver(post_save, sender=HeureTravail)
-def maj_heures_tache(sender, instance, **kwargs):
-    """Signal : Mettre à jour heures_reelles quand on ajoute."""
-    instance.tache.calculer_heures_reelles()
-
-
 @receiver(post_save, sender=Chantier)
 def log_changement_chantier(sender, instance, created, **kwargs):
     """Signal : Logger les créations/modifications de chantier."""
     if created:
         logger.info(
-            f"Chantier créé : {instance.numero} - {instance.nom}"
+            "Chantier créé : %s - %s", instance.numero, instance.nom
         )
     else:
-        logger.info(f"Chantier modifié : {instance.numero}")
+        logger.info("Chantier modifié : %s", instance.numero)
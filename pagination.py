@@ -0,0 +1,24 @@
+# =================================================================
+# pagination.py - Pagination des listes volumineuses
+# Pagination par curseur (keyset) : ni COUNT(*) ni OFFSET croissant
+# =================================================================
+
+from rest_framework.pagination import CursorPagination
+
+
+class TacheCursorPagination(CursorPagination):
+    """
+    Tâches : la page suivante reprend après la dernière valeur vue
+    (WHERE date_fin_prevue > ... LIMIT 20), quelle que soit la profondeur.
+    L'ordre demandé via ?ordering= (OrderingFilter) reste respecté.
+    """
+
+    page_size = 20
+    ordering = 'date_fin_prevue'
+
+
+class HeureTravailCursorPagination(CursorPagination):
+    """Heures travaillées : même principe, les plus récentes d'abord."""
+
+    page_size = 20
+    ordering = '-date'
@@ -64,20 +64,24 @@ class IsMembreEquipe(BasePermission):
     message = "Vous n'êtes pas membre de cette équipe."
 
     def has_object_permission(self, request, view, obj):
-        try:
-            membre = Membre.objects.get(user=request.user)
-
-            # Vérifier si le membre appartient à l'équipe
-            if hasattr(obj, 'equipe'):
-                return (
-                    obj.equipe == membre.equipe or
-                    request.user.is_staff
-                )
+        # Un seul SELECT par requête, même si plusieurs objets sont vérifiés
+        if not hasattr(request, '_membre_equipe'):
+            request._membre_equipe = Membre.objects.filter(
+                user=request.user
+            ).first()
+        membre = request._membre_equipe
+
+        if membre is None:
+            return request.user.is_staff
 
-            return False
+        # Vérifier si le membre appartient à l'équipe
+        if hasattr(obj, 'equipe'):
+            return (
+                obj.equipe_id == membre.equipe_id or
+                request.user.is_staff
+            )
 
-        except Membre.DoesNotExist:
-            return request.user.is_staff
+        return False
 
 
 class IsAuthenticated(BasePermission):
@@ -153,12 +157,18 @@ class ChantiersFilter(django_filters.FilterSet):
     )
 
     def filter_en_retard(self, queryset, name, value):
-        """Filtrer par chantiers en retard."""
+        """
+        Filtrer par chantiers en retard, sur les colonnes (même règle que
+        l'annotation en_retard du listing, absente des autres actions).
+        """
         if value:
-            today = timezone.now().date()
+            now = getattr(self.request, '_now', None) or timezone.now()
             return queryset.filter(
-                date_fin_prevue__lt=today,
-                status__in=['EN_COURS', 'EN_ATTENTE']
+                date_fin_prevue__lt=now.date(),
+                status__in=[
+                    StatusChantier.EN_COURS,
+                    StatusChantier.EN_ATTENTE
+                ]
             )
 
         return queryset
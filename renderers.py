@@ -0,0 +1,34 @@
+# =================================================================
+# renderers.py - Rendu JSON de l'API
+# Encodeur orjson (extension C) à la place du module json standard
+# =================================================================
+
+import orjson
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(renderers.BaseRenderer):
+    """
+    Rendu JSON via orjson.
+    Les types que orjson ne connaît pas (Decimal, chaînes traduites,
+    querysets...) passent par l'encodeur DRF, comme avec JSONRenderer.
+    """
+
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    _default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        option = orjson.OPT_NON_STR_KEYS
+        # Browsable API / ?indent : orjson ne sait indenter que sur 2
+        renderer_context = renderer_context or {}
+        if renderer_context.get('indent'):
+            option |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(data, default=self._default, option=option)
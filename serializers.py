@@ -3,10 +3,34 @@
 # Validation des données entrantes/sortantes
 # =================================================================
 
+import copy
+import functools
 import logging
+from collections.abc import Mapping
+from decimal import ROUND_HALF_UP, Decimal
 
 from django.contrib.auth.models import User
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models, transaction
+from django.db.models import (
+    BigIntegerField,
+    BooleanField,
+    Case,
+    Count,
+    DecimalField,
+    F,
+    Prefetch,
+    Q,
+    Sum,
+    Value,
+    When
+)
+from django.db.models.functions import Cast, Coalesce, Round
+from django.utils import timezone
+from django.utils.functional import cached_property
 from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
 
 from .models import (
     Chantier,
@@ -17,26 +41,290 @@ from .models import (
     Equipe,
     Membre,
     SousTraitant,
-    Anomalie
+    Anomalie,
+    StatusTache,
+    cout_heures_expression,
+    get_bornes_mois
 )
 
 logger = logging.getLogger(__name__)
 
 
+# =================================================================
+# UTILITAIRES
+# =================================================================
+
+
+def memoize_par_requete(method):
+    """
+    Mémorise le résultat d'un get_* de SerializerMethodField le temps
+    d'une requête, clé (modèle, pk, méthode), pour ne pas recalculer
+    un même objet sérialisé plusieurs fois (listing + imbrications).
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, obj):
+        request = self.context.get('request')
+        if request is None or obj.pk is None:
+            return method(self, obj)
+
+        cache = getattr(request, '_method_cache', None)
+        if cache is None:
+            cache = request._method_cache = {}
+
+        key = (obj._meta.label, obj.pk, method.__name__)
+        if key not in cache:
+            cache[key] = method(self, obj)
+        return cache[key]
+
+    return wrapper
+
+
+def formater_centimes(centimes):
+    """'1234.50' à partir de 123450 centimes, sans passer par Decimal."""
+    signe = '-' if centimes < 0 else ''
+    unites, reste = divmod(abs(centimes), 100)
+    return f'{signe}{unites}.{reste:02d}'
+
+
+class CachedFieldsMixin:
+    """
+    Met en cache par classe les champs construits par get_fields()
+    (introspection du modèle) ; chaque instance reçoit des copies
+    superficielles, liées ensuite à elle seule par DRF.
+    Les listes de champs lisibles/modifiables sont figées une fois par
+    instance : DRF les recalcule sinon à chaque objet sérialisé.
+    """
+
+    _fields_cache = {}
+
+    def get_fields(self):
+        cls = type(self)
+        cached = self._fields_cache.get(cls)
+        if cached is None:
+            cached = super().get_fields()
+            self._fields_cache[cls] = cached
+        return {name: copy.copy(field) for name, field in cached.items()}
+
+    @cached_property
+    def _readable_fields(self):
+        return [
+            field for field in self.fields.values()
+            if not field.write_only
+        ]
+
+    @cached_property
+    def _writable_fields(self):
+        return [
+            field for field in self.fields.values()
+            if not field.read_only
+        ]
+
+
+class CompiledRepresentationMixin:
+    """
+    to_representation spécialisé par classe : une fonction sans boucle,
+    générée une fois, lit directement les colonnes du modèle
+    (instance.numero) au lieu de passer par field.get_attribute().
+    Les autres champs (relations, SerializerMethodField...) gardent le
+    chemin DRF ; le rendu de chaque valeur reste celui du champ.
+    """
+
+    _representation_cache = {}
+
+    @classmethod
+    def compile_representation(cls, fields):
+        fonction = cls._representation_cache.get(cls)
+        if fonction is not None:
+            return fonction
+
+        colonnes = {
+            field.name for field in cls.Meta.model._meta.concrete_fields
+            if not field.is_relation
+        }
+        lignes = ['def to_representation(instance, rep, get):', '    ret = {}']
+        for i, field in enumerate(fields):
+            cle = repr(field.field_name)
+            source = field.source_attrs
+            if field.source == '*':
+                lignes.append(f'    ret[{cle}] = rep[{i}](instance)')
+            elif len(source) == 1 and source[0] in colonnes:
+                lignes += [
+                    f'    v = instance.{source[0]}',
+                    f'    ret[{cle}] = None if v is None else rep[{i}](v)',
+                ]
+            else:
+                lignes += [
+                    '    try:',
+                    f'        v = get[{i}](instance)',
+                    '    except SkipField:',
+                    '        pass',
+                    '    else:',
+                    '        c = v.pk if isinstance(v, PKOnlyObject) else v',
+                    f'        ret[{cle}] = None if c is None else rep[{i}](v)',
+                ]
+        lignes.append('    return ret')
+
+        namespace = {'SkipField': SkipField, 'PKOnlyObject': PKOnlyObject}
+        code = compile(
+            '\n'.join(lignes), f'<{cls.__name__}.to_representation>', 'exec'
+        )
+        exec(code, namespace)
+        fonction = cls._representation_cache[cls] = (
+            namespace['to_representation']
+        )
+        return fonction
+
+    @cached_property
+    def _representation_args(self):
+        fields = self._readable_fields
+        return (
+            self.compile_representation(fields),
+            tuple(field.to_representation for field in fields),
+            tuple(field.get_attribute for field in fields),
+        )
+
+    def to_representation(self, instance):
+        if isinstance(instance, Mapping):
+            # Données validées (pas encore d'instance) : chemin DRF
+            return super().to_representation(instance)
+        fonction, rep, get = self._representation_args
+        return fonction(instance, rep, get)
+
+
+class SerializerOptimizerMixin:
+    """
+    Déduit de Meta.fields les colonnes à charger avec .only() : seuls les
+    champs du modèle non redéclarés (ni SerializerMethodField, ni
+    serializer imbriqué) sont retenus, plus la clé primaire.
+    """
+
+    @classmethod
+    def get_only_fields(cls):
+        model = cls.Meta.model
+        colonnes = [model._meta.pk.name]
+        for name in cls.Meta.fields:
+            if name in cls._declared_fields:
+                continue
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue  # annotation
+            if field.concrete and not field.many_to_many:
+                if field.name not in colonnes:
+                    colonnes.append(field.name)
+        return colonnes
+
+
+class BatchedListSerializer(serializers.ListSerializer):
+    """
+    Sérialisation de liste en deux temps : le child prépare en une passe
+    les valeurs calculées de tous les objets (prepare_batch), puis chaque
+    get_* ne fait plus qu'une lecture dans self.parent._batch.
+    """
+
+    def to_representation(self, data):
+        if isinstance(data, models.manager.BaseManager):
+            data = data.all()
+        items = list(data)
+        self._batch = self.child.prepare_batch(items, self.context)
+        self._prepare_users(items)
+        return super().to_representation(items)
+
+    def _prepare_users(self, items):
+        """
+        Rend une seule fois chaque utilisateur référencé par la liste
+        (child.user_fields) dans context['user_map'] ; les utilisateurs
+        déjà chargés (select_related) ne sont pas relus en base.
+        """
+        user_fields = getattr(self.child, 'user_fields', ())
+        if not user_fields:
+            return
+
+        user_map = self.context.setdefault('user_map', {})
+        charges, a_charger = {}, set()
+        for item in items:
+            for name in user_fields:
+                user_id = getattr(item, f'{name}_id')
+                if user_id is None or user_id in user_map:
+                    continue
+                if item._meta.get_field(name).is_cached(item):
+                    charges[user_id] = getattr(item, name)
+                else:
+                    a_charger.add(user_id)
+
+        if charges or a_charger:
+            user_map.update(UserSerializer.bulk_serialize_users(
+                a_charger | set(charges), users=charges
+            ))
+
+
+class BatchedFieldsMixin:
+    """
+    Lecture des valeurs préparées par BatchedListSerializer ; hors liste
+    (détail, objet imbriqué), elles sont préparées pour le seul objet.
+    """
+
+    # Clés étrangères vers User rendues via context['user_map']
+    user_fields = ()
+
+    @classmethod
+    def prepare_batch(cls, items, context):
+        return {item.pk: {} for item in items}
+
+    def get_user_detail(self, obj, name):
+        """Utilisateur `name` de obj, rendu une fois par liste."""
+        user_id = getattr(obj, f'{name}_id')
+        if user_id is None:
+            return None
+        user_map = self.context.get('user_map', {})
+        if user_id in user_map:
+            return user_map[user_id]
+        # Un seul UserSerializer (champs liés une fois) par serializer
+        serializer = self.__dict__.get('_user_serializer')
+        if serializer is None:
+            serializer = self._user_serializer = UserSerializer()
+        return serializer.to_representation(getattr(obj, name))
+
+    def get_batch(self, obj):
+        batch = getattr(self.parent, '_batch', None)
+        if batch is None or obj.pk not in batch:
+            batch = self.__dict__.setdefault('_batch_local', {})
+            if obj.pk not in batch:
+                batch.update(self.prepare_batch([obj], self.context))
+        return batch[obj.pk]
+
+
 # =================================================================
 # NESTED SERIALIZERS (Objets imbriqués)
 # =================================================================
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Données utilisateur minimales."""
 
     class Meta:
         model = User
         fields = ['id', 'first_name', 'last_name', 'email']
 
-
-class MembreBasicSerializer(serializers.ModelSerializer):
+    @classmethod
+    def bulk_serialize_users(cls, user_ids, users=None):
+        """
+        {id: données} pour user_ids, en une requête pour ceux qui ne sont
+        pas déjà fournis dans `users`.
+        """
+        users = dict(users or {})
+        manquants = set(user_ids) - set(users)
+        if manquants:
+            users.update(User.objects.filter(id__in=manquants).in_bulk())
+        serializer = cls()
+        return {
+            pk: serializer.to_representation(user)
+            for pk, user in users.items()
+        }
+
+
+class MembreBasicSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Infos basiques d'un membre."""
 
     class Meta:
@@ -49,7 +337,7 @@ class MembreBasicSerializer(serializers.ModelSerializer):
 # =================================================================
 
 
-class ChantiersSerializer(serializers.ModelSerializer):
+class ChantiersSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Sérializer principal pour Chantier.
     Lecture/écriture complète avec validation métier.
@@ -79,14 +367,6 @@ class ChantiersSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['date_creation', 'creé_par', 'cout_reel']
 
-    def validate_numero(self, value):
-        """Valide unicité du numéro."""
-        if Chantier.objects.filter(numero=value).exists():
-            raise serializers.ValidationError(
-                "Ce numéro existe déjà."
-            )
-        return value
-
     def validate(self, data):
         """Validations cross-fields."""
         if data['date_debut'] >= data['date_fin_prevue']:
@@ -101,17 +381,56 @@ class ChantiersSerializer(serializers.ModelSerializer):
 
         return data
 
+    @memoize_par_requete
     def get_progression(self, obj):
         """% d'avancement."""
-        return round(obj.get_progression_percentage(), 1)
+        return round(obj.progression_pct, 1)
 
+    @memoize_par_requete
     def get_jours_restants(self, obj):
-        """Jours avant fin."""
-        return obj.jours_restants()
+        """Jours avant fin (annotés par la vue si possible)."""
+        return obj.get_jours_restants(today=self.context.get('today'))
 
+    @memoize_par_requete
     def get_nombre_taches(self, obj):
-        """Nombre total de tâches."""
-        return sum(lot.taches.count() for lot in obj.lots.all())
+        """Nombre total de tâches (annoté par la vue si possible)."""
+        nombre = getattr(obj, '_nombre_taches', None)
+        if nombre is None:
+            nombre = Tache.objects.filter(lot__chantier=obj).count()
+        return nombre
+
+
+class ChantiersListSerializer(
+    SerializerOptimizerMixin,
+    CachedFieldsMixin,
+    serializers.ModelSerializer
+):
+    """
+    Sérializer allégé pour le listing des chantiers.
+    Ne lit que les colonnes chargées par la vue (.only()).
+    """
+
+    progression = serializers.SerializerMethodField()
+    jours_restants = serializers.SerializerMethodField()
+    en_retard = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = Chantier
+        fields = [
+            'id', 'numero', 'nom', 'ville', 'status',
+            'date_debut', 'date_fin_prevue', 'budget_total',
+            'progression', 'jours_restants', 'en_retard'
+        ]
+        read_only_fields = fields
+
+    @memoize_par_requete
+    def get_progression(self, obj):
+        """% d'avancement (compteurs annotés par la vue)."""
+        return round(obj.progression_pct, 1)
+
+    def get_jours_restants(self, obj):
+        """Jours avant fin (écart annoté par la vue)."""
+        return obj.get_jours_restants(today=self.context.get('today'))
 
 
 class ChantiersDetailSerializer(ChantiersSerializer):
@@ -133,15 +452,20 @@ class ChantiersDetailSerializer(ChantiersSerializer):
 # =================================================================
 
 
-class LotSerializer(serializers.ModelSerializer):
+class LotSerializer(
+    SerializerOptimizerMixin,
+    BatchedFieldsMixin,
+    CompiledRepresentationMixin,
+    CachedFieldsMixin,
+    serializers.ModelSerializer
+):
     """Lot de chantier avec tâches imbriquées."""
 
     progression = serializers.SerializerMethodField()
     nombre_taches = serializers.SerializerMethodField()
-    responsable_detail = UserSerializer(
-        source='responsable',
-        read_only=True
-    )
+    responsable_detail = serializers.SerializerMethodField()
+
+    user_fields = ('responsable',)
 
     class Meta:
         model = Lot
@@ -154,12 +478,67 @@ class LotSerializer(serializers.ModelSerializer):
             'date_creation'
         ]
         read_only_fields = ['date_creation']
+        list_serializer_class = BatchedListSerializer
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Précharger le responsable et annoter les compteurs de tâches."""
+        return queryset.select_related('responsable').annotate(
+            _nombre_taches=Count('taches'),
+            _taches_terminees=Count(
+                'taches',
+                filter=Q(taches__status=StatusTache.TERMINEE)
+            )
+        )
 
+    @classmethod
+    def prepare_batch(cls, items, context):
+        """
+        Compteurs de tâches de tous les lots : annotations ou tâches
+        préchargées si présentes, sinon un seul agrégat groupé par lot.
+        """
+        a_compter = {
+            lot.pk for lot in items
+            if getattr(lot, '_nombre_taches', None) is None and
+            'taches' not in getattr(lot, '_prefetched_objects_cache', {})
+        }
+        compteurs = {}
+        if a_compter:
+            compteurs = {
+                row['lot']: row
+                for row in Tache.objects.filter(lot__in=a_compter).values(
+                    'lot'
+                ).annotate(
+                    total=Count('id'),
+                    done=Count('id', filter=Q(status=StatusTache.TERMINEE))
+                )
+            }
+
+        batch = {}
+        for lot in items:
+            if lot.pk in a_compter:
+                row = compteurs.get(lot.pk, {'total': 0, 'done': 0})
+                lot._nombre_taches = row['total']
+                lot._taches_terminees = row['done']
+            nombre = getattr(lot, '_nombre_taches', None)
+            if nombre is None:
+                nombre = len(lot.taches.all())  # tâches préchargées
+            batch[lot.pk] = {
+                'progression': round(lot.get_progression_percentage(), 1),
+                'nombre_taches': nombre,
+            }
+        return batch
+
+    @memoize_par_requete
     def get_progression(self, obj):
-        return round(obj.get_progression_percentage(), 1)
+        return self.get_batch(obj)['progression']
 
+    @memoize_par_requete
     def get_nombre_taches(self, obj):
-        return obj.taches.count()
+        return self.get_batch(obj)['nombre_taches']
+
+    def get_responsable_detail(self, obj):
+        return self.get_user_detail(obj, 'responsable')
 
 
 # =================================================================
@@ -167,7 +546,13 @@ class LotSerializer(serializers.ModelSerializer):
 # =================================================================
 
 
-class TacheSerializer(serializers.ModelSerializer):
+class TacheSerializer(
+    SerializerOptimizerMixin,
+    BatchedFieldsMixin,
+    CompiledRepresentationMixin,
+    CachedFieldsMixin,
+    serializers.ModelSerializer
+):
     """
     Tâche complète avec relations.
     Utilisé par l'API mobile pour suivi terrain.
@@ -197,36 +582,122 @@ class TacheSerializer(serializers.ModelSerializer):
         read_only_fields = [
             'date_creation', 'heures_reelles', 'cout_total'
         ]
+        list_serializer_class = BatchedListSerializer
+
+    @classmethod
+    def prepare_batch(cls, items, context):
+        """
+        en_retard avec une seule date pour toute la liste, et un seul
+        dictionnaire equipe_detail par équipe (partagé entre ses tâches).
+        """
+        today = context.get('today') or timezone.now().date()
+        equipes = {}
+        batch = {}
+        for tache in items:
+            if tache.equipe_id and tache.equipe_id not in equipes:
+                equipe = tache.equipe
+                equipes[tache.equipe_id] = {
+                    'id': equipe.id,
+                    'nom': equipe.nom,
+                    'specialite': equipe.specialite,
+                    'chef': str(equipe.chef) if equipe.chef else None,
+                }
+            en_retard = getattr(tache, '_en_retard', None)
+            if en_retard is None:
+                en_retard = tache.est_en_retard(today=today)
+            batch[tache.pk] = {
+                'en_retard': en_retard,
+                'equipe_detail': equipes.get(tache.equipe_id),
+            }
+        return batch
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, today=None):
+        """
+        Compteurs d'heures/photos, coût et flag de retard annotés,
+        anomalies ouvertes préchargées : aucune requête par tâche
+        à la sérialisation.
+        """
+        today = today or timezone.now().date()
+        return queryset.select_related('equipe__chef').annotate(
+            # Round avant Cast : le CAST seul tronquerait (SQLite)
+            _cout_centimes=Cast(
+                Round(cout_heures_expression() * 100),
+                output_field=BigIntegerField()
+            ),
+            _nombre_heures=Count('heures_travail', distinct=True),
+            _nombre_photos=Count('photos', distinct=True),
+            # Même règle que Tache.est_en_retard
+            _en_retard=Case(
+                When(
+                    status=StatusTache.TERMINEE,
+                    date_fin_reelle__gt=F('date_fin_prevue'),
+                    then=Value(True)
+                ),
+                When(
+                    ~Q(status=StatusTache.TERMINEE),
+                    date_fin_prevue__lt=today,
+                    then=Value(True)
+                ),
+                default=Value(False),
+                output_field=BooleanField()
+            )
+        ).prefetch_related(
+            Prefetch(
+                'anomalies',
+                queryset=AnomalieSerializer.setup_eager_loading(
+                    Anomalie.objects.filter(
+                        statut__in=['OUVERTE', 'EN_COURS']
+                    ),
+                    today=today
+                ),
+                to_attr='_anomalies_ouvertes'
+            ),
+            'sous_traitants'
+        )
 
     def get_equipe_detail(self, obj):
-        if obj.equipe:
-            return {
-                'id': obj.equipe.id,
-                'nom': obj.equipe.nom,
-                'specialite': obj.equipe.specialite,
-                'chef': (
-                    str(obj.equipe.chef) if obj.equipe.chef else None
-                ),
-            }
-        return None
+        return self.get_batch(obj)['equipe_detail']
 
     def get_heures_travail_count(self, obj):
-        return obj.heures_travail.count()
+        nombre = getattr(obj, '_nombre_heures', None)
+        if nombre is None:
+            nombre = obj.heures_travail.count()
+        return nombre
 
     def get_cout_total(self, obj):
-        return str(obj.calculer_cout_heures())
+        # Annoté (en centimes) par setup_eager_loading ; calcul Python sinon
+        centimes = getattr(obj, '_cout_centimes', None)
+        if centimes is None:
+            centimes = int(
+                (obj.calculer_cout_heures() * 100).to_integral_value(
+                    ROUND_HALF_UP
+                )
+            )
+        return formater_centimes(centimes)
 
     def get_en_retard(self, obj):
-        return obj.est_en_retard()
+        return self.get_batch(obj)['en_retard']
 
     def get_photos_count(self, obj):
-        return obj.photos.count()
+        nombre = getattr(obj, '_nombre_photos', None)
+        if nombre is None:
+            nombre = obj.photos.count()
+        return nombre
 
     def get_anomalies(self, obj):
-        anomalies = obj.anomalies.filter(
-            statut__in=['OUVERTE', 'EN_COURS']
-        )
-        return AnomalieSerializer(anomalies, many=True).data
+        anomalies = getattr(obj, '_anomalies_ouvertes', None)
+        if anomalies is None:
+            anomalies = obj.anomalies.filter(
+                statut__in=['OUVERTE', 'EN_COURS']
+            )
+        # Un seul serializer de liste réutilisé pour toutes les tâches
+        serializer = self.__dict__.get('_anomalies_serializer')
+        if serializer is None:
+            serializer = self._anomalies_serializer = AnomalieSerializer(
+                many=True, context=self.context
+            )
+        return serializer.to_representation(anomalies)
 
 
 # =================================================================
@@ -234,15 +705,20 @@ class TacheSerializer(serializers.ModelSerializer):
 # =================================================================
 
 
-class HeuresTravailSerializer(serializers.ModelSerializer):
+class HeuresTravailSerializer(
+    SerializerOptimizerMixin,
+    BatchedFieldsMixin,
+    CompiledRepresentationMixin,
+    CachedFieldsMixin,
+    serializers.ModelSerializer
+):
     """Enregistrement des heures (point d'entrée pour mobile)."""
 
     tache_detail = TacheSerializer(source='tache', read_only=True)
     membre_detail = MembreBasicSerializer(source='membre', read_only=True)
-    validee_par_detail = UserSerializer(
-        source='validee_par',
-        read_only=True
-    )
+    validee_par_detail = serializers.SerializerMethodField()
+
+    user_fields = ('validee_par',)
 
     class Meta:
         model = HeureTravail
@@ -257,6 +733,10 @@ class HeuresTravailSerializer(serializers.ModelSerializer):
         read_only_fields = [
             'date_enregistrement', 'validee_par'
         ]
+        list_serializer_class = BatchedListSerializer
+
+    def get_validee_par_detail(self, obj):
+        return self.get_user_detail(obj, 'validee_par')
 
     def validate_heures(self, value):
         """Valide que les heures sont positives et ≤ 24."""
@@ -276,31 +756,78 @@ class HeuresTravailSerializer(serializers.ModelSerializer):
 # =================================================================
 
 
-class PhotoRapportSerializer(serializers.ModelSerializer):
+class ImageUrlField(serializers.ImageField):
+    """
+    URL absolue d'une image sans build_absolute_uri() par ligne : le
+    schéma et l'hôte de la requête sont lus une fois et partagés par
+    toute la liste (context['_host']), puis simplement préfixés.
+    """
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        url = value.url
+        if not url.startswith('/'):
+            return url  # Stockage distant : URL déjà absolue
+
+        host = self.context.get('_host')
+        if host is None:
+            request = self.context.get('request')
+            host = request._current_scheme_host if request else ''
+            self.context['_host'] = host
+        return host + url
+
+
+class PhotoRapportSerializer(
+    BatchedFieldsMixin,
+    CachedFieldsMixin,
+    serializers.ModelSerializer
+):
     """Upload et gestion des photos terrain."""
 
-    uploadée_par_detail = UserSerializer(
-        source='uploadée_par',
-        read_only=True
-    )
-    approuvee_par_detail = UserSerializer(
-        source='approuvee_par',
-        read_only=True
-    )
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.ImageField: ImageUrlField,
+    }
+
+    uploadée_par_detail = serializers.SerializerMethodField()
+    approuvee_par_detail = serializers.SerializerMethodField()
+
+    user_fields = ('uploadée_par', 'approuvee_par')
 
     class Meta:
         model = PhotoRapport
         fields = [
             'id', 'tache', 'titre', 'description',
             'image', 'latitude', 'longitude',
+            'miniature', 'traitee',
             'date_photo', 'approuvee', 'approuvee_par',
             'approuvee_par_detail',
             'uploadée_par', 'uploadée_par_detail',
             'date_upload'
         ]
         read_only_fields = [
-            'date_upload', 'uploadée_par', 'approuvee_par'
+            'date_upload', 'uploadée_par', 'approuvee_par',
+            'miniature', 'traitee'
         ]
+        list_serializer_class = BatchedListSerializer
+
+    def get_uploadée_par_detail(self, obj):
+        return self.get_user_detail(obj, 'uploadée_par')
+
+    def get_approuvee_par_detail(self, obj):
+        return self.get_user_detail(obj, 'approuvee_par')
+
+    def create(self, validated_data):
+        """
+        Enregistrer la photo brute puis confier le traitement (EXIF,
+        miniature) au worker Celery, une fois la transaction validée.
+        """
+        from .tasks import planifier_traitement_photo
+
+        photo = super().create(validated_data)
+        transaction.on_commit(lambda: planifier_traitement_photo(photo.id))
+        return photo
 
     def validate_image(self, value):
         """Valide taille et format de l'image."""
@@ -316,7 +843,7 @@ class PhotoRapportSerializer(serializers.ModelSerializer):
 # =================================================================
 
 
-class EquipeSerializer(serializers.ModelSerializer):
+class EquipeSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Équipes de travail."""
 
     chef_detail = MembreBasicSerializer(source='chef', read_only=True)
@@ -341,7 +868,12 @@ class EquipeSerializer(serializers.ModelSerializer):
 # =================================================================
 
 
-class MembreSerializer(serializers.ModelSerializer):
+class MembreSerializer(
+    SerializerOptimizerMixin,
+    BatchedFieldsMixin,
+    CachedFieldsMixin,
+    serializers.ModelSerializer
+):
     """Profil complet d'un membre."""
 
     equipe_detail = EquipeSerializer(source='equipe', read_only=True)
@@ -358,9 +890,60 @@ class MembreSerializer(serializers.ModelSerializer):
             'date_creation'
         ]
         read_only_fields = ['date_creation']
+        list_serializer_class = BatchedListSerializer
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, today=None):
+        """Annoter les heures du mois courant (un SUM filtré)."""
+        debut_mois, mois_suivant = get_bornes_mois(today)
+        return queryset.select_related('equipe').annotate(
+            _heures_mois=Coalesce(
+                Sum(
+                    'heures_travail__heures',
+                    filter=Q(
+                        heures_travail__date__gte=debut_mois,
+                        heures_travail__date__lt=mois_suivant
+                    )
+                ),
+                Value(Decimal('0')),
+                output_field=DecimalField(max_digits=10, decimal_places=2)
+            )
+        )
+
+    @classmethod
+    def prepare_batch(cls, items, context):
+        """
+        Heures du mois de tous les membres : annotation de la vue
+        (_heures_mois) si présente, sinon un seul SUM groupé par membre.
+        """
+        a_sommer = [
+            membre.pk for membre in items
+            if getattr(membre, '_heures_mois', None) is None
+        ]
+        totaux = {}
+        if a_sommer:
+            debut_mois, mois_suivant = get_bornes_mois(context.get('today'))
+            totaux = dict(
+                HeureTravail.objects.filter(
+                    membre__in=a_sommer,
+                    date__gte=debut_mois,
+                    date__lt=mois_suivant
+                ).values('membre').annotate(
+                    total=Sum('heures')
+                ).values_list('membre', 'total')
+            )
+
+        batch = {}
+        for membre in items:
+            if getattr(membre, '_heures_mois', None) is not None:
+                heures = membre.get_heures_ce_mois()
+            else:
+                heures = totaux.get(membre.pk) or 0
+            batch[membre.pk] = {'heures_ce_mois': float(heures)}
+        return batch
 
     def get_heures_ce_mois(self, obj):
-        return float(obj.get_heures_ce_mois())
+        return self.get_batch(obj)['heures_ce_mois']
 
 
 # =================================================================
@@ -368,7 +951,7 @@ class MembreSerializer(serializers.ModelSerializer):
 # =================================================================
 
 
-class SousTraitantSerializer(serializers.ModelSerializer):
+class SousTraitantSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Gestion des prestataires externes."""
 
     class Meta:
@@ -389,19 +972,20 @@ class SousTraitantSerializer(serializers.ModelSerializer):
 # =================================================================
 
 
-class AnomalieSerializer(serializers.ModelSerializer):
+class AnomalieSerializer(
+    BatchedFieldsMixin,
+    CompiledRepresentationMixin,
+    CachedFieldsMixin,
+    serializers.ModelSerializer
+):
     """Signalements et anomalies."""
 
-    signalee_par_detail = UserSerializer(
-        source='signalee_par',
-        read_only=True
-    )
-    responsable_detail = UserSerializer(
-        source='responsable_correction',
-        read_only=True
-    )
+    signalee_par_detail = serializers.SerializerMethodField()
+    responsable_detail = serializers.SerializerMethodField()
     en_retard = serializers.SerializerMethodField()
 
+    user_fields = ('signalee_par', 'responsable_correction')
+
     class Meta:
         model = Anomalie
         fields = [
@@ -416,9 +1000,44 @@ class AnomalieSerializer(serializers.ModelSerializer):
         read_only_fields = [
             'date_creation', 'date_modification', 'signalee_par'
         ]
+        list_serializer_class = BatchedListSerializer
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, today=None):
+        """Flag de retard annoté (même règle qu'Anomalie.est_en_retard)."""
+        today = today or timezone.now().date()
+        return queryset.annotate(
+            _en_retard=Case(
+                When(
+                    ~Q(statut='FERMEE'),
+                    date_resolution_prevue__lt=today,
+                    then=Value(True)
+                ),
+                default=Value(False),
+                output_field=BooleanField()
+            )
+        )
+
+    @classmethod
+    def prepare_batch(cls, items, context):
+        """en_retard annoté si possible, sinon date commune à la liste."""
+        today = context.get('today') or timezone.now().date()
+        batch = {}
+        for anomalie in items:
+            en_retard = getattr(anomalie, '_en_retard', None)
+            if en_retard is None:
+                en_retard = anomalie.est_en_retard(today=today)
+            batch[anomalie.pk] = {'en_retard': en_retard}
+        return batch
 
     def get_en_retard(self, obj):
-        return obj.est_en_retard()
+        return self.get_batch(obj)['en_retard']
+
+    def get_signalee_par_detail(self, obj):
+        return self.get_user_detail(obj, 'signalee_par')
+
+    def get_responsable_detail(self, obj):
+        return self.get_user_detail(obj, 'responsable_correction')
 
 
 # =================================================================
@@ -4,6 +4,7 @@
 # =================================================================
 
 import os
+import sys
 from pathlib import Path
 
 # =================================================================
@@ -60,6 +61,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Third-party apps
     'rest_framework',
@@ -67,6 +69,7 @@ INSTALLED_APPS = [
     'corsheaders',
     'django_filters',
     'drf_yasg',
+    'cachalot',
 
     # Local apps
     'chantiers',
@@ -80,6 +83,8 @@ MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
+    'chantiers.middleware.UploadSizeLimitMiddleware',
+    'chantiers.middleware.RequestClockMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -124,13 +129,75 @@ DATABASES = {
         'PASSWORD': os.environ.get('DB_PASSWORD', 'postgres'),
         'HOST': os.environ.get('DB_HOST', 'localhost'),
         'PORT': os.environ.get('DB_PORT', '5432'),
+        # Connexions persistantes, vérifiées avant réutilisation
         'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
         'OPTIONS': {
             'connect_timeout': 10,
+            'options': '-c statement_timeout=5000',
         }
     }
 }
 
+# Tests (manage.py test / pytest) : SQLite en mémoire par défaut.
+# TEST_DATABASE=postgresql garde PostgreSQL (plans de requête réels) ;
+# la base de test est clonée depuis TEST_DB_TEMPLATE, une base modèle où
+# l'extension pg_trgm est déjà installée (index trigram de la migration
+# 0002, créés seulement avec pytest --migrations).
+EN_TEST = 'test' in sys.argv or 'pytest' in sys.modules
+
+if EN_TEST:
+    if os.environ.get('TEST_DATABASE', 'sqlite') == 'postgresql':
+        DATABASES['default']['TEST'] = {
+            'NAME': os.environ.get('TEST_DB_NAME', 'test_chantiers'),
+            'TEMPLATE': os.environ.get(
+                'TEST_DB_TEMPLATE',
+                'test_chantiers_tpl'
+            ),
+        }
+    else:
+        DATABASES = {
+            'default': {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': ':memory:',
+            }
+        }
+
+# =================================================================
+# CACHE (Redis + cache des requêtes ORM)
+# =================================================================
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL', 'redis://localhost:6379/1'),
+    },
+    # Schéma OpenAPI : en mémoire du processus, donc régénéré à chaque
+    # redémarrage (rechargement du runserver après modification du code)
+    'schema': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'TIMEOUT': None,
+    },
+}
+
+# django-cachalot : les SELECT identiques (dashboards) sont servis depuis
+# Redis et invalidés à chaque écriture sur les tables concernées
+CACHALOT_CACHE = 'default'
+
+# Table très sollicitée en écriture (saisie mobile des heures) :
+# l'invalidation permanente coûterait plus que le cache ne rapporte
+CACHALOT_UNCACHABLE_TABLES = [
+    'django_migrations',
+    'chantiers_heuretravail',
+]
+
+# Tests : ni serveur Redis requis, ni cache ORM entre deux assertions
+if EN_TEST:
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+    CACHALOT_ENABLED = False
+
 # =================================================================
 # VALIDATION DES MOTS DE PASSE
 # =================================================================
@@ -186,10 +253,15 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 
 # WhiteNoise pour servir les fichiers statiques
+# (gzip + Brotli précompressés au collectstatic si brotli est installé)
 STATICFILES_STORAGE = (
     'whitenoise.storage.CompressedManifestStaticFilesStorage'
 )
 
+# Seuls les fichiers hashés sont publiés : WhiteNoise les sert avec un
+# Cache-Control immutable d'un an
+WHITENOISE_KEEP_ONLY_HASHED_FILES = True
+
 # =================================================================
 # FICHIERS MEDIA (Uploads utilisateurs)
 # =================================================================
@@ -219,7 +291,7 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'chantiers.renderers.ORJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -237,6 +309,32 @@ if DEBUG:
         'rest_framework.renderers.BrowsableAPIRenderer'
     )
 
+# =================================================================
+# CELERY (Tâches de fond)
+# =================================================================
+
+CELERY_BROKER_URL = os.environ.get(
+    'CELERY_BROKER_URL',
+    'redis://localhost:6379/0'
+)
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_TIMEZONE = TIME_ZONE
+
+# Traitement des photos sur une file dédiée :
+# celery -A config worker -Q photos
+CELERY_TASK_ROUTES = {
+    'chantiers.tasks.traiter_photo': {'queue': 'photos'},
+}
+
+# Reprise des photos dont l'envoi au worker a échoué :
+# celery -A config beat
+CELERY_BEAT_SCHEDULE = {
+    'reprise-photos-en-attente': {
+        'task': 'chantiers.tasks.traiter_photos_en_attente',
+        'schedule': 600,
+    },
+}
+
 # =================================================================
 # CORS (Cross-Origin Resource Sharing)
 # =================================================================
@@ -341,6 +439,16 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 DATA_UPLOAD_MAX_MEMORY_SIZE = 20 * 1024 * 1024
 FILE_UPLOAD_MAX_MEMORY_SIZE = 20 * 1024 * 1024
 
+# Corps multipart refusé d'emblée au-delà de cette taille (photo 5 MB
+# + champs du formulaire), voir UploadSizeLimitMiddleware
+MAX_UPLOAD_SIZE = 6 * 1024 * 1024
+
+# Les photos mobiles sont écrites par morceaux dans un fichier temporaire
+# au lieu d'être copiées entièrement en mémoire avant d'atteindre la vue
+FILE_UPLOAD_HANDLERS = [
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
 # Email backend (en développement)
 if DEBUG:
     EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
@@ -0,0 +1,107 @@
+# =================================================================
+# tasks.py - Tâches de fond (Celery)
+# Traitements lourds sortis du cycle requête/réponse
+# =================================================================
+
+import logging
+import os
+from datetime import timedelta
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from kombu.exceptions import OperationalError
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# App du projet (et non l'app Celery par défaut, qui publierait sur
+# amqp://localhost) : config/__init__.py n'est pas toujours chargé
+# avant l'envoi d'une tâche depuis Django
+from config.celery import app
+
+from .models import PhotoRapport
+
+logger = logging.getLogger(__name__)
+
+TAILLE_MINIATURE = (320, 320)
+
+# Photos non traitées reprises par traiter_photos_en_attente : assez
+# vieilles pour ne plus être en file, assez récentes pour ne pas
+# relancer indéfiniment une image illisible
+DELAI_REPRISE = timedelta(minutes=10)
+FENETRE_REPRISE = timedelta(days=1)
+
+
+def planifier_traitement_photo(photo_id):
+    """
+    Envoie traiter_photo au worker. Un broker indisponible ne doit pas
+    faire échouer l'upload (la photo est déjà enregistrée) : l'erreur
+    est journalisée et traiter_photos_en_attente reprendra la photo.
+    """
+    try:
+        traiter_photo.delay(photo_id)
+    except OperationalError:
+        logger.exception("Traitement de la photo %s non planifié", photo_id)
+
+
+@app.task
+def traiter_photo(photo_id):
+    """
+    Retire les métadonnées EXIF (GPS de l'appareil, etc.) de la photo
+    et génère sa miniature, puis marque la photo comme traitée.
+    Le fichier est écrit via le stockage configuré (local ou S3).
+    """
+    photo = PhotoRapport.objects.filter(pk=photo_id, traitee=False).first()
+    if photo is None:
+        return
+
+    try:
+        with photo.image.open('rb') as fichier:
+            image = Image.open(fichier)
+            format_image = image.format
+            # Appliquer l'orientation EXIF avant de la supprimer
+            image = ImageOps.exif_transpose(image)
+            image.load()
+    except (UnidentifiedImageError, OSError) as exc:
+        logger.warning("Photo %s illisible : %s", photo_id, exc)
+        return
+
+    ancien_nom = photo.image.name
+    nom = os.path.basename(ancien_nom)
+
+    # Ré-encodage sans EXIF (Pillow ne recopie pas les métadonnées)
+    sortie = BytesIO()
+    image.save(sortie, format=format_image)
+    photo.image.save(nom, ContentFile(sortie.getvalue()), save=False)
+
+    miniature = image.copy()
+    miniature.thumbnail(TAILLE_MINIATURE)
+    sortie = BytesIO()
+    miniature.save(sortie, format=format_image)
+    photo.miniature.save(nom, ContentFile(sortie.getvalue()), save=False)
+
+    photo.traitee = True
+    photo.save(
+        update_fields=['image', 'miniature', 'traitee', 'date_modification']
+    )
+
+    if ancien_nom != photo.image.name:
+        photo.image.storage.delete(ancien_nom)
+
+    logger.info("Photo traitée : %s", photo_id)
+
+
+@app.task
+def traiter_photos_en_attente():
+    """
+    Replanifie les photos restées non traitées (broker indisponible
+    à l'upload, worker arrêté...). Lancée par celery beat.
+    """
+    maintenant = timezone.now()
+    photo_ids = PhotoRapport.objects.filter(
+        traitee=False,
+        date_upload__gte=maintenant - FENETRE_REPRISE,
+        date_upload__lt=maintenant - DELAI_REPRISE,
+    ).values_list('pk', flat=True)
+
+    for photo_id in photo_ids:
+        planifier_traitement_photo(photo_id)
@@ -3,22 +3,30 @@
 # Framework : pytest + pytest-django
 # =================================================================
 
-from datetime import timedelta
+from datetime import date, timedelta
 from decimal import Decimal
+from io import BytesIO
+from unittest import mock
 
 import factory
 import pytest
 from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.utils import timezone
 from faker import Faker
+from kombu.exceptions import OperationalError
+from PIL import Image
 
+from . import tasks
 from .models import (
+    Anomalie,
     Chantier,
     Lot,
     Tache,
     HeureTravail,
     Equipe,
     Membre,
+    PhotoRapport,
     StatusChantier,
     StatusTache,
     RoleMembre,
@@ -27,6 +35,9 @@ from .models import (
 
 fake = Faker('fr_FR')
 
+# Date de référence fixe : tests reproductibles, sans lecture d'horloge
+TODAY = date(2024, 1, 15)
+
 
 # =================================================================
 # FACTORIES - Génération de données de test
@@ -123,6 +134,31 @@ class TacheFactory(factory.django.DjangoModelFactory):
     equipe = factory.SubFactory(EquipeFactory)
 
 
+def bulk_chantiers(n):
+    """
+    n chantiers (et leurs chefs) en deux INSERT groupés, au lieu d'un
+    INSERT par objet et par SubFactory avec create_batch().
+    """
+    users = User.objects.bulk_create(
+        [UserFactory.build() for _ in range(n)]
+    )
+    return Chantier.objects.bulk_create([
+        ChantiersFactory.build(chef=user, creé_par=user)
+        for user in users
+    ])
+
+
+def image_jpeg(nom='photo.jpg', taille=(800, 600)):
+    """Petite image JPEG en mémoire, avec une balise EXIF (Make)."""
+    exif = Image.Exif()
+    exif[0x010F] = 'Appareil test'
+    sortie = BytesIO()
+    Image.new('RGB', taille, 'gray').save(sortie, 'JPEG', exif=exif)
+    return SimpleUploadedFile(
+        nom, sortie.getvalue(), content_type='image/jpeg'
+    )
+
+
 # =================================================================
 # TESTS DE MODÈLES
 # =================================================================
@@ -177,11 +213,11 @@ class TestTacheModel:
         """Détecter une tâche en retard."""
         # Tâche avec date de fin passée
         tache = TacheFactory(
-            date_fin_prevue=timezone.now().date() - timedelta(days=1),
+            date_fin_prevue=TODAY - timedelta(days=1),
             status=StatusTache.EN_COURS
         )
 
-        assert tache.est_en_retard() is True
+        assert tache.est_en_retard(today=TODAY) is True
 
     def test_calculer_heures_tache(self):
         """Mettre à jour les heures réelles d'une tâche."""
@@ -193,7 +229,7 @@ class TestTacheModel:
             tache=tache,
             membre=membre,
             heures=Decimal('8.5'),
-            date=timezone.now().date()
+            date=TODAY
         )
 
         tache.calculer_heures_reelles()
@@ -213,7 +249,7 @@ class TestHeureTravailModel:
             tache=tache,
             membre=membre,
             heures=Decimal('8.0'),
-            date=timezone.now().date()
+            date=TODAY
         )
 
         assert heures.id is not None
@@ -231,6 +267,42 @@ class TestHeureTravailModel:
                 heures=Decimal('-5.0')
             )
 
+    def test_bulk_ingest_heures(self):
+        """L'ingestion en masse met à jour le total de chaque tâche."""
+        tache_a = TacheFactory()
+        tache_b = TacheFactory()
+        membre = MembreFactory()
+
+        HeureTravail.bulk_ingest([
+            HeureTravail(tache=tache_a, membre=membre, heures=Decimal('4.0')),
+            HeureTravail(tache=tache_a, membre=membre, heures=Decimal('3.5')),
+            HeureTravail(tache=tache_b, membre=membre, heures=Decimal('2.0')),
+        ])
+
+        tache_a.refresh_from_db()
+        tache_b.refresh_from_db()
+        assert tache_a.heures_reelles == Decimal('7.5')
+        assert tache_b.heures_reelles == Decimal('2.0')
+
+    def test_heures_reelles_sans_cumul_d_arrondis(self):
+        """heures_reelles est arrondi une fois, sur le total."""
+        tache = TacheFactory()
+        membre = MembreFactory()
+
+        entrees = [
+            HeureTravail.objects.create(
+                tache=tache, membre=membre, heures=Decimal('0.25'),
+                date=TODAY
+            )
+            for _ in range(3)
+        ]
+        tache.refresh_from_db()
+        assert tache.heures_reelles == Decimal('0.8')
+
+        entrees[0].delete()
+        tache.refresh_from_db()
+        assert tache.heures_reelles == Decimal('0.5')
+
 
 # =================================================================
 # TESTS API (DRF)
@@ -246,37 +318,25 @@ class TestChantiersAPI:
         response = client.get('/api/v1/chantiers/')
         assert response.status_code == 401
 
-    @pytest.fixture
-    def api_client_auth(self):
-        """Client authentifié."""
-        from rest_framework.test import APIClient
-
-        client = APIClient()
-        user = UserFactory()
-        client.force_authenticate(user=user)
-        return client
-
     def test_list_chantiers_avec_auth(self, api_client_auth):
         """Listing avec authentification."""
-        ChantiersFactory.create_batch(3)
+        bulk_chantiers(3)
         response = api_client_auth.get('/api/v1/chantiers/')
 
         assert response.status_code == 200
-        assert len(response.data['results']) == 3
+        assert response.data['count'] == 3
 
     def test_creer_chantier(self, api_client_auth):
         """Créer un chantier via API."""
-        from datetime import date
-
         data = {
             'numero': 'CH-TEST-001',
             'nom': 'Test Chantier',
             'adresse': '123 rue de Test',
             'codepostal': '69000',
             'ville': 'Lyon',
-            'date_debut': date.today().isoformat(),
+            'date_debut': TODAY.isoformat(),
             'date_fin_prevue': (
-                date.today() + timedelta(days=30)
+                TODAY + timedelta(days=30)
             ).isoformat(),
             'budget_total': '50000.00'
         }
@@ -290,6 +350,37 @@ class TestChantiersAPI:
         assert response.status_code == 201
         assert response.data['numero'] == 'CH-TEST-001'
 
+    def test_filtre_en_retard_hors_listing(self, api_client_auth):
+        """?en_retard= sur une action sans annotation (pas d'erreur 500)."""
+        chantier = ChantiersFactory(date_fin_prevue=TODAY)
+
+        response = api_client_auth.get(
+            f'/api/v1/chantiers/{chantier.id}/anomalies/?en_retard=true'
+        )
+
+        assert response.status_code == 200
+
+    def test_modifier_date_fin(self, api_client_auth):
+        """jours_restants renvoyé après un PATCH suit la nouvelle date."""
+        chantier = ChantiersFactory(
+            chef=User.objects.get(username='api-client'),
+            date_debut=date(2023, 1, 1),
+            date_fin_prevue=date(2100, 1, 1)
+        )
+
+        response = api_client_auth.patch(
+            f'/api/v1/chantiers/{chantier.id}/',
+            {
+                'date_debut': '2023-01-01',
+                'date_fin_prevue': TODAY.isoformat(),
+                'budget_total': '50000.00'
+            },
+            format='json'
+        )
+
+        assert response.status_code == 200
+        assert response.data['jours_restants'] == 0
+
     def test_rapport_chantier(self, api_client_auth):
         """Endpoint rapport du chantier."""
         chantier = ChantiersFactory()
@@ -306,22 +397,15 @@ class TestChantiersAPI:
 class TestTachesAPI:
     """Tests des endpoints de tâches."""
 
-    @pytest.fixture
-    def api_client_auth(self):
-        from rest_framework.test import APIClient
-
-        client = APIClient()
-        user = UserFactory()
-        client.force_authenticate(user=user)
-        return client
-
     def test_enregistrer_heures(self, api_client_auth):
         """Enregistrer des heures via l'API mobile."""
         tache = TacheFactory()
         membre = MembreFactory()
 
         data = {
+            'tache': tache.id,
             'membre': membre.id,
+            'date': TODAY.isoformat(),
             'heures': '8.5',
             'description': 'Travaux de maçonnerie',
             'latitude': 45.123456,
@@ -335,7 +419,36 @@ class TestTachesAPI:
         )
 
         assert response.status_code == 201
-        assert response.data['heures'] == 8.5
+        assert float(response.data['heures']) == 8.5
+        assert response.data['tache_detail']['heures_travail_count'] == 1
+
+    def test_modifier_taux_horaire(self, api_client_auth):
+        """Le coût renvoyé après un PATCH tient compte du nouveau taux."""
+        tache = TacheFactory(heures_reelles=Decimal('10.00'))
+
+        response = api_client_auth.patch(
+            f'/api/v1/taches/{tache.id}/',
+            {'taux_horaire': '60.00'},
+            format='json'
+        )
+
+        assert response.status_code == 200
+        assert response.data['cout_total'] == '600.00'
+
+    def test_cout_total_arrondi(self, api_client_auth):
+        """Coût arrondi au centime, identique en lecture et après PATCH."""
+        tache = TacheFactory(
+            heures_reelles=Decimal('10.5'), taux_horaire=Decimal('45.55')
+        )
+        url = f'/api/v1/taches/{tache.id}/'
+
+        lecture = api_client_auth.get(url)
+        ecriture = api_client_auth.patch(
+            url, {'nom': 'Coffrage'}, format='json'
+        )
+
+        assert lecture.data['cout_total'] == '478.28'
+        assert ecriture.data['cout_total'] == '478.28'
 
     def test_upload_photo(self, api_client_auth):
         """Upload d'une photo (MOBILE)."""
@@ -367,6 +480,164 @@ class TestTachesAPI:
 
         assert response.status_code == 201
 
+    def test_heures_etag_suit_anomalies(self, api_client_auth):
+        """Une anomalie (rendue dans tache_detail) change l'ETag des heures."""
+        tache = TacheFactory()
+        url = f'/api/v1/taches/{tache.id}/heures/'
+        etag = api_client_auth.get(url)['ETag']
+
+        Anomalie.objects.create(
+            tache=tache,
+            titre='Fissure',
+            description='Fissure sur dalle',
+            severite='MINEURE'
+        )
+
+        response = api_client_auth.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
+    def test_photos_non_modifiees(self, api_client_auth):
+        """Liste inchangée : 304 avec l'ETag de la réponse précédente."""
+        tache = TacheFactory()
+        url = f'/api/v1/taches/{tache.id}/photos/'
+
+        response = api_client_auth.get(url)
+        assert response.status_code == 200
+
+        response = api_client_auth.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        assert response.status_code == 304
+
+
+@pytest.mark.django_db
+class TestHeuresAPI:
+    """Tests des endpoints d'heures travaillées."""
+
+    def test_bulk_heures(self, api_client_auth):
+        """Synchronisation hors-ligne : un lot, une réponse compacte."""
+        tache = TacheFactory()
+        membre = MembreFactory()
+
+        data = [
+            {'tache': tache.id, 'membre': membre.id, 'heures': '4.0'},
+            {'tache': tache.id, 'membre': membre.id, 'heures': '3.5'},
+        ]
+
+        response = api_client_auth.post(
+            '/api/v1/heures/bulk/',
+            data,
+            format='json'
+        )
+
+        assert response.status_code == 201
+        assert response.data == {'count': 2}
+        tache.refresh_from_db()
+        assert tache.heures_reelles == Decimal('7.5')
+
+
+@pytest.mark.django_db
+class TestAnomaliesAPI:
+    """Tests des endpoints d'anomalies."""
+
+    def test_fermer_anomalie_en_retard(self, api_client_auth):
+        """Une anomalie fermée n'est plus en retard dans la réponse."""
+        anomalie = Anomalie.objects.create(
+            tache=TacheFactory(),
+            titre='Fissure',
+            description='Fissure sur dalle',
+            severite='MAJEURE',
+            date_resolution_prevue=TODAY - timedelta(days=10)
+        )
+
+        response = api_client_auth.post(
+            f'/api/v1/anomalies/{anomalie.id}/fermer/'
+        )
+
+        assert response.status_code == 200
+        assert response.data['statut'] == 'FERMEE'
+        assert response.data['en_retard'] is False
+
+
+@pytest.mark.django_db
+class TestTraitementPhotos:
+    """Tests du traitement des photos en tâche de fond."""
+
+    @pytest.fixture(autouse=True)
+    def media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+
+    def poster_photo(self, client, tache):
+        return client.post(
+            f'/api/v1/taches/{tache.id}/photo/',
+            {'tache': tache.id, 'titre': 'Photo avant',
+             'image': image_jpeg()},
+            format='multipart'
+        )
+
+    def test_upload_planifie_traitement(
+        self, api_client_auth, django_capture_on_commit_callbacks
+    ):
+        """Le traitement est envoyé au worker après le commit."""
+        tache = TacheFactory()
+
+        with mock.patch.object(tasks.traiter_photo, 'delay') as delay:
+            with django_capture_on_commit_callbacks(execute=True):
+                response = self.poster_photo(api_client_auth, tache)
+
+        assert response.status_code == 201
+        delay.assert_called_once_with(response.data['id'])
+
+    def test_upload_broker_indisponible(
+        self, api_client_auth, django_capture_on_commit_callbacks
+    ):
+        """Un broker injoignable ne fait pas échouer l'upload."""
+        tache = TacheFactory()
+
+        with mock.patch.object(
+            tasks.traiter_photo, 'delay', side_effect=OperationalError
+        ):
+            with django_capture_on_commit_callbacks(execute=True):
+                response = self.poster_photo(api_client_auth, tache)
+
+        assert response.status_code == 201
+        assert PhotoRapport.objects.get(
+            pk=response.data['id']
+        ).traitee is False
+
+    def test_traiter_photo(self):
+        """EXIF retiré, miniature 320px générée, photo marquée."""
+        photo = PhotoRapport.objects.create(
+            tache=TacheFactory(), image=image_jpeg()
+        )
+
+        tasks.traiter_photo(photo.id)
+
+        photo.refresh_from_db()
+        assert photo.traitee is True
+        with Image.open(photo.image.path) as image:
+            assert image.size == (800, 600)
+            assert not image.getexif()
+        with Image.open(photo.miniature.path) as miniature:
+            assert miniature.size == (320, 240)
+
+    def test_reprise_photos_en_attente(self):
+        """Seules les photos non traitées et anciennes sont reprises."""
+        tache = TacheFactory()
+        ancienne = PhotoRapport.objects.create(
+            tache=tache, image=image_jpeg()
+        )
+        PhotoRapport.objects.create(tache=tache, image=image_jpeg())
+        PhotoRapport.objects.filter(pk=ancienne.pk).update(
+            date_upload=timezone.now() - timedelta(hours=1)
+        )
+
+        with mock.patch.object(tasks.traiter_photo, 'delay') as delay:
+            tasks.traiter_photos_en_attente()
+
+        delay.assert_called_once_with(ancienne.id)
+
 
 # =================================================================
 # TESTS DE PERFORMANCE
@@ -380,14 +651,33 @@ class TestPerformance:
     def test_no_n_plus_1_list_chantiers(self, django_assert_num_queries):
         """Vérifier que list chantiers n'a pas N+1 queries."""
         # Créer des chantiers
-        ChantiersFactory.create_batch(5)
+        bulk_chantiers(5)
 
-        # Les requêtes doivent être minimales
-        with django_assert_num_queries(5):  # Approximatif
+        # Une seule requête (JOIN sur le chef), quel que soit le nombre
+        with django_assert_num_queries(1):
             chantiers = list(Chantier.objects.select_related('chef'))
             for c in chantiers:
                 _ = c.chef.username  # Accéder au chef
 
+    @pytest.mark.parametrize('nombre_lots', [1, 10])
+    def test_rapport_nombre_requetes_constant(
+        self, api_client_auth, django_assert_max_num_queries, nombre_lots
+    ):
+        """Le rapport ne fait pas une requête par lot ou par tâche."""
+        chantier = ChantiersFactory()
+        for lot in LotFactory.create_batch(nombre_lots, chantier=chantier):
+            TacheFactory(lot=lot, status=StatusTache.TERMINEE)
+
+        # chantier, version du cache, stats tâches, compteurs, lots
+        with django_assert_max_num_queries(5):
+            response = api_client_auth.get(
+                f'/api/v1/chantiers/{chantier.id}/rapport/'
+            )
+
+        assert response.status_code == 200
+        assert response.data['taches_totales'] == nombre_lots
+        assert len(response.data['lots']) == nombre_lots
+
 
 # =================================================================
 # COMMANDES POUR LANCER LES TESTS
@@ -7,7 +7,7 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import DefaultRouter, SimpleRouter
 
 from chantiers.views import (
     AnomaliesViewSet,
@@ -24,7 +24,9 @@ from chantiers.views import (
 # CONFIGURATION DU ROUTEUR DRF
 # =================================================================
 
-router = DefaultRouter()
+# Vue racine navigable (/api/v1/) et suffixes .json réservés au
+# développement : SimpleRouter se limite aux routes des viewsets
+router = DefaultRouter() if settings.DEBUG else SimpleRouter()
 router.register(r'chantiers', ChantiersViewSet, basename='chantier')
 router.register(r'lots', LotsViewSet, basename='lot')
 router.register(r'taches', TachesViewSet, basename='tache')
@@ -82,15 +84,28 @@ if settings.DEBUG:
         permission_classes=[permissions.AllowAny],
     )
 
+    # Le schéma parcourt tous les serializers : généré une fois par
+    # processus puis servi depuis le cache 'schema'
+    SCHEMA_CACHE_TIMEOUT = 60 * 60 * 24
+    SCHEMA_CACHE_KWARGS = {'cache': 'schema'}
+
     urlpatterns += [
         path(
             'swagger/',
-            schema_view.with_ui('swagger', cache_timeout=0),
+            schema_view.with_ui(
+                'swagger',
+                cache_timeout=SCHEMA_CACHE_TIMEOUT,
+                cache_kwargs=SCHEMA_CACHE_KWARGS
+            ),
             name='schema-swagger-ui'
         ),
         path(
             'redoc/',
-            schema_view.with_ui('redoc', cache_timeout=0),
+            schema_view.with_ui(
+                'redoc',
+                cache_timeout=SCHEMA_CACHE_TIMEOUT,
+                cache_kwargs=SCHEMA_CACHE_KWARGS
+            ),
             name='schema-redoc'
         ),
     ]
@@ -4,11 +4,33 @@
 # =================================================================
 
 import logging
+from decimal import Decimal
 
 from django.contrib.auth.models import User
-from django.db.models import Sum
+from django.core.cache import cache
+from django.db.models import (
+    BooleanField,
+    Case,
+    Count,
+    DateField,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Func,
+    IntegerField,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When
+)
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
@@ -25,12 +47,17 @@ from .models import (
     Lot,
     Membre,
     SousTraitant,
-    Tache
+    StatusChantier,
+    StatusTache,
+    Tache,
+    get_bornes_mois
 )
+from .pagination import HeureTravailCursorPagination, TacheCursorPagination
 from .permissions_filters import IsChefOrReadOnly
 from .serializers import (
     AnomalieSerializer,
     ChantiersDetailSerializer,
+    ChantiersListSerializer,
     ChantiersSerializer,
     EquipeSerializer,
     HeuresTravailSerializer,
@@ -38,11 +65,39 @@ from .serializers import (
     MembreSerializer,
     PhotoRapportSerializer,
     SousTraitantSerializer,
-    TacheSerializer
+    TacheSerializer,
+    UserSerializer
 )
 
 logger = logging.getLogger(__name__)
 
+# Durée de vie du rapport chantier en cache (secondes)
+RAPPORT_CACHE_TTL = 300
+
+
+def get_today(request):
+    """Date du jour lue une fois par requête (RequestClockMiddleware)."""
+    now = getattr(request, '_now', None) or timezone.now()
+    return now.date()
+
+
+def compter(queryset):
+    """COUNT(*) de queryset sous forme de sous-requête scalaire."""
+    return Coalesce(
+        Subquery(
+            queryset.order_by().annotate(
+                _n=Func(F('pk'), function='COUNT', output_field=IntegerField())
+            ).values('_n')
+        ),
+        0
+    )
+
+
+# Invariant : tout .only() appliqué à un queryset préchargé (Prefetch) doit
+# conserver 'id' et les clés étrangères de rattachement (lot_id, equipe_id,
+# membre_id, tache_id...). Sinon Django relit la colonne différée pour
+# chaque ligne au moment d'associer les objets (une requête par ligne).
+
 
 # =================================================================
 # VIEWSET : CHANTIERS
@@ -62,9 +117,7 @@ class ChantiersViewSet(viewsets.ModelViewSet):
     - GET /api/v1/chantiers/{id}/rapport/ → Rapport complet
     """
 
-    queryset = Chantier.objects.filter(
-        actif=True
-    ).prefetch_related('lots__taches')
+    queryset = Chantier.objects.filter(actif=True)
     serializer_class = ChantiersSerializer
     permission_classes = [IsAuthenticated, IsChefOrReadOnly]
     filter_backends = [
@@ -77,8 +130,74 @@ class ChantiersViewSet(viewsets.ModelViewSet):
     ordering_fields = ['date_creation', 'date_debut', 'status']
     ordering = ['-date_creation']
 
+    def get_queryset(self):
+        """
+        Précalculer en SQL les compteurs de tâches, le flag en_retard et
+        les jours restants. Le listing ne charge que les colonnes affichées.
+        """
+        if self.action in ('equipes', 'anomalies'):
+            # Le chantier ne sert que de clé de filtrage
+            return super().get_queryset().only('id')
+        if self.action == 'rapport':
+            # Statistiques requêtées à part : colonnes de l'en-tête seules
+            return super().get_queryset().only(
+                'id', 'numero', 'nom', 'adresse', 'codepostal', 'ville',
+                'status', 'chef', 'date_debut', 'date_fin_prevue',
+                'date_fin_reelle', 'budget_total', 'cout_reel'
+            )
+
+        if self.action not in ('list', 'retrieve'):
+            # Écritures : jours restants, retard et progression sont
+            # recalculés sur l'instance à jour, pas annotés avant l'écriture
+            return super().get_queryset().select_related('chef')
+
+        today = get_today(self.request)
+        queryset = super().get_queryset().annotate(
+            _nombre_taches=Count('lots__taches'),
+            _taches_terminees=Count(
+                'lots__taches',
+                filter=Q(lots__taches__status=StatusTache.TERMINEE)
+            ),
+            en_retard=Case(
+                When(
+                    date_fin_prevue__lt=today,
+                    status__in=[
+                        StatusChantier.EN_COURS,
+                        StatusChantier.EN_ATTENTE
+                    ],
+                    then=Value(True)
+                ),
+                default=Value(False),
+                output_field=BooleanField()
+            ),
+            _jours_restants=ExpressionWrapper(
+                F('date_fin_prevue') - Value(today, output_field=DateField()),
+                output_field=DurationField()
+            )
+        )
+        if self.action == 'list':
+            return queryset.only(*ChantiersListSerializer.get_only_fields())
+
+        # Seul le détail rend les lots (rapport : projection values())
+        return queryset.select_related('chef').prefetch_related(
+            Prefetch(
+                'lots',
+                queryset=Lot.objects.select_related(
+                    'responsable'
+                ).prefetch_related('taches')
+            )
+        )
+
+    def get_serializer_context(self):
+        """Date du jour calculée une seule fois pour toute la requête."""
+        context = super().get_serializer_context()
+        context['today'] = get_today(self.request)
+        return context
+
     def get_serializer_class(self):
-        """Utiliser serializer détaillé pour retrieve."""
+        """Serializer allégé pour list, détaillé pour retrieve."""
+        if self.action == 'list':
+            return ChantiersListSerializer
         if self.action == 'retrieve':
             return ChantiersDetailSerializer
         return super().get_serializer_class()
@@ -87,8 +206,8 @@ class ChantiersViewSet(viewsets.ModelViewSet):
         """Ajouter l'utilisateur actuel comme créateur."""
         serializer.save(creé_par=self.request.user)
         logger.info(
-            f"Chantier créé : {serializer.instance.numero} "
-            f"par {self.request.user}"
+            "Chantier créé : %s par %s",
+            serializer.instance.numero, self.request.user
         )
 
     @action(detail=True, methods=['get'])
@@ -99,46 +218,73 @@ class ChantiersViewSet(viewsets.ModelViewSet):
         """
         chantier = self.get_object()
 
-        # Calculer les stats
-        lots = chantier.lots.all()
-        taches_totales = sum(lot.taches.count() for lot in lots)
-        taches_terminees = sum(
-            lot.taches.filter(status='TERMINEE').count()
-            for lot in lots
-        )
-
-        heures_estimees = sum(
-            lot.taches.aggregate(
-                Sum('heures_estimees')
-            )['heures_estimees__sum'] or 0
-            for lot in lots
-        )
-
-        heures_reelles = sum(
-            lot.taches.aggregate(
-                Sum('heures_reelles')
-            )['heures_reelles__sum'] or 0
-            for lot in lots
+        # Clé versionnée par la dernière modification : pas d'invalidation
+        cle = f'rapport:{chantier.pk}:{chantier.get_version_rapport()}'
+        data = cache.get(cle)
+        if data is not None:
+            return Response(data, status=status.HTTP_200_OK)
+
+        # Calculer les stats (une seule requête pour toutes les tâches)
+        stats = Tache.objects.filter(lot__chantier=chantier).aggregate(
+            total=Count('id'),
+            terminees=Count('id', filter=Q(status=StatusTache.TERMINEE)),
+            heures_estimees=Coalesce(
+                Sum('heures_estimees'), Value(Decimal('0'))
+            ),
+            heures_reelles=Coalesce(
+                Sum('heures_reelles'), Value(Decimal('0'))
+            )
         )
+        taches_totales = stats['total']
+        taches_terminees = stats['terminees']
+        heures_estimees = stats['heures_estimees']
+        heures_reelles = stats['heures_reelles']
 
         progression = (
             (taches_terminees / taches_totales * 100)
             if taches_totales else 0
         )
 
-        anomalies_ouvertes = Anomalie.objects.filter(
-            tache__lot__chantier=chantier,
-            statut__in=['OUVERTE', 'EN_COURS']
-        ).count()
-
-        membres_actifs = Membre.objects.filter(
-            equipe__taches__lot__chantier=chantier,
-            actif=True
-        ).distinct().count()
+        # Anomalies ouvertes et membres actifs : un seul aller-retour
+        anomalies_ouvertes, membres_actifs = Chantier.objects.filter(
+            pk=chantier.pk
+        ).annotate(
+            _anomalies_ouvertes=compter(Anomalie.objects.filter(
+                tache__lot__chantier=OuterRef('pk'),
+                statut__in=['OUVERTE', 'EN_COURS']
+            )),
+            _membres_actifs=compter(Membre.objects.filter(
+                equipe_id__in=Tache.objects.filter(
+                    lot__chantier=OuterRef(OuterRef('pk'))
+                ).values('equipe_id'),
+                actif=True
+            ))
+        ).values_list('_anomalies_ouvertes', '_membres_actifs').get()
 
         data = {
-            'chantier': ChantiersSerializer(chantier).data,
-            'lots': LotSerializer(lots, many=True).data,
+            # En-tête du chantier construit à la main : avancement et
+            # coûts figurent déjà au premier niveau du rapport
+            'chantier': {
+                'id': chantier.id,
+                'numero': chantier.numero,
+                'nom': chantier.nom,
+                'adresse': chantier.adresse,
+                'codepostal': chantier.codepostal,
+                'ville': chantier.ville,
+                'status': chantier.status,
+                'chef': chantier.chef_id,
+                'date_debut': chantier.date_debut,
+                'date_fin_prevue': chantier.date_fin_prevue,
+                'date_fin_reelle': chantier.date_fin_reelle,
+                'jours_restants': chantier.get_jours_restants(
+                    today=get_today(request)
+                ),
+            },
+            # Résumé des lots : simple projection SQL, sans serializer
+            'lots': list(chantier.lots.values(
+                'id', 'numero', 'nom', 'status', 'budget_lot',
+                'date_debut_prevue', 'date_fin_prevue'
+            )),
             'taches_totales': taches_totales,
             'taches_terminees': taches_terminees,
             'progression_percentage': round(progression, 1),
@@ -149,6 +295,7 @@ class ChantiersViewSet(viewsets.ModelViewSet):
             'anomalies_ouvertes': anomalies_ouvertes,
             'membres_actifs': membres_actifs,
         }
+        cache.set(cle, data, RAPPORT_CACHE_TTL)
 
         return Response(data, status=status.HTTP_200_OK)
 
@@ -156,9 +303,14 @@ class ChantiersViewSet(viewsets.ModelViewSet):
     def equipes(self, request, pk=None):
         """Lister les équipes affectées à ce chantier."""
         chantier = self.get_object()
+        # Sous-requête sur les ids : ni jointure multipliée ni DISTINCT
         equipes = Equipe.objects.filter(
-            taches__lot__chantier=chantier
-        ).distinct()
+            id__in=Tache.objects.filter(
+                lot__chantier=chantier
+            ).values('equipe_id')
+        ).select_related('chef').annotate(
+            _membres_count=Count('membres', filter=Q(membres__actif=True))
+        )
         serializer = EquipeSerializer(equipes, many=True)
         return Response(serializer.data)
 
@@ -166,8 +318,11 @@ class ChantiersViewSet(viewsets.ModelViewSet):
     def anomalies(self, request, pk=None):
         """Lister les anomalies du chantier."""
         chantier = self.get_object()
-        anomalies = Anomalie.objects.filter(
-            tache__lot__chantier=chantier
+        anomalies = AnomalieSerializer.setup_eager_loading(
+            Anomalie.objects.filter(
+                tache__lot__chantier=chantier
+            ).select_related('signalee_par', 'responsable_correction'),
+            today=get_today(request)
         ).order_by('-date_creation')
 
         # Filtrer par statut si fourni
@@ -175,7 +330,9 @@ class ChantiersViewSet(viewsets.ModelViewSet):
         if statut:
             anomalies = anomalies.filter(statut=statut)
 
-        serializer = AnomalieSerializer(anomalies, many=True)
+        serializer = AnomalieSerializer(
+            anomalies, many=True, context=self.get_serializer_context()
+        )
         return Response(serializer.data)
 
 
@@ -199,10 +356,13 @@ class LotsViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Retourner les lots du chantier fourni."""
+        queryset = LotSerializer.setup_eager_loading(Lot.objects.all())
+        if self.action == 'list':
+            queryset = queryset.only(*LotSerializer.get_only_fields())
         chantier_id = self.request.query_params.get('chantier_id')
         if chantier_id:
-            return Lot.objects.filter(chantier_id=chantier_id)
-        return Lot.objects.all()
+            return queryset.filter(chantier_id=chantier_id)
+        return queryset
 
 
 # =================================================================
@@ -227,6 +387,7 @@ class TachesViewSet(viewsets.ModelViewSet):
 
     serializer_class = TacheSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TacheCursorPagination
     filter_backends = [
         DjangoFilterBackend,
         filters.SearchFilter,
@@ -237,18 +398,55 @@ class TachesViewSet(viewsets.ModelViewSet):
     ordering_fields = ['date_fin_prevue', 'status', 'date_debut_prevue']
     ordering = ['date_fin_prevue']
 
+    def get_serializer_context(self):
+        """Date du jour calculée une seule fois pour toute la requête."""
+        context = super().get_serializer_context()
+        context['today'] = get_today(self.request)
+        return context
+
     def get_queryset(self):
-        """Optimiser les requêtes avec select_related."""
-        return Tache.objects.select_related(
-            'lot__chantier', 'equipe'
-        ).prefetch_related(
-            'heures_travail', 'photos', 'anomalies', 'sous_traitants'
+        """
+        Optimiser les requêtes (annotations + préchargements).
+        Le listing ne charge que les colonnes sérialisées.
+        """
+        cle_seule = self.action in (
+            'photo', 'photos', 'anomalies', 'signaler_anomalie'
+        ) or (self.action == 'heures' and self.request.method == 'GET')
+        if cle_seule:
+            # La tâche n'y est qu'une clé (rendue par son id) : ni
+            # annotations ni préchargements
+            return Tache.objects.only('id', 'numero', 'date_modification')
+
+        if self.action not in ('list', 'retrieve'):
+            # Écritures (update, POST heures...) : compteurs, coût et
+            # retard sont recalculés sur l'instance à jour, pas annotés
+            # avant l'écriture
+            return Tache.objects.select_related('equipe__chef')
+
+        # lot est rendu par son id : pas de jointure lot/chantier
+        queryset = TacheSerializer.setup_eager_loading(
+            Tache.objects.all(), today=get_today(self.request)
         )
+        if self.action == 'list':
+            return queryset.only(*TacheSerializer.get_only_fields())
+        return queryset
 
     def perform_create(self, serializer):
         """Log création."""
         instance = serializer.save()
-        logger.info(f"Tâche créée : {instance.numero}")
+        logger.info("Tâche créée : %s", instance.numero)
+
+    def get_etag_liste(self, tache, *relations):
+        """
+        ETag d'une liste de la tâche : version de chaque relation rendue
+        (la liste elle-même, plus celles de tache_detail le cas échéant),
+        de la tâche et date du jour (champs en_retard).
+        """
+        versions = [tache.get_version_liste(nom) for nom in relations]
+        return quote_etag('-'.join(versions + [
+            str(tache.date_modification.timestamp()),
+            get_today(self.request).isoformat(),
+        ]))
 
     @action(
         detail=True,
@@ -270,7 +468,9 @@ class TachesViewSet(viewsets.ModelViewSet):
         }
         """
         tache = self.get_object()
-        serializer = PhotoRapportSerializer(data=request.data)
+        serializer = PhotoRapportSerializer(
+            data=request.data, context=self.get_serializer_context()
+        )
 
         if serializer.is_valid():
             photo = serializer.save(
@@ -278,11 +478,10 @@ class TachesViewSet(viewsets.ModelViewSet):
                 uploadée_par=request.user
             )
             logger.info(
-                f"Photo uploadée : {photo.id} "
-                f"pour tâche {tache.numero}"
+                "Photo uploadée : %s pour tâche %s", photo.id, tache.numero
             )
             return Response(
-                PhotoRapportSerializer(photo).data,
+                serializer.data,
                 status=status.HTTP_201_CREATED
             )
 
@@ -300,21 +499,43 @@ class TachesViewSet(viewsets.ModelViewSet):
         tache = self.get_object()
 
         if request.method == 'GET':
-            heures = tache.heures_travail.all().order_by('-date')
-            serializer = HeuresTravailSerializer(heures, many=True)
-            return Response(serializer.data)
+            # Liste inchangée depuis le dernier appel : 304 sans sérialiser
+            # tache_detail rend aussi photos_count et anomalies ouvertes
+            etag = self.get_etag_liste(
+                tache, 'heures_travail', 'photos', 'anomalies'
+            )
+            non_modifie = get_conditional_response(request, etag=etag)
+            if non_modifie is not None:
+                return non_modifie
+
+            # Ordre -date du Meta ; la tâche commune à toutes les lignes
+            # (tache_detail) est chargée une seule fois
+            heures = tache.heures_travail.select_related(
+                'membre', 'validee_par'
+            ).prefetch_related(Prefetch(
+                'tache',
+                queryset=TacheSerializer.setup_eager_loading(
+                    Tache.objects.all(), today=get_today(request)
+                )
+            ))
+            serializer = HeuresTravailSerializer(
+                heures, many=True, context=self.get_serializer_context()
+            )
+            return Response(serializer.data, headers={'ETag': etag})
 
         elif request.method == 'POST':
             # Créer une nouvelle entrée d'heures
-            serializer = HeuresTravailSerializer(data=request.data)
+            serializer = HeuresTravailSerializer(
+                data=request.data, context=self.get_serializer_context()
+            )
             if serializer.is_valid():
                 heures = serializer.save(tache=tache)
                 logger.info(
-                    f"Heures enregistrées : {heures.heures}h "
-                    f"pour {tache.numero}"
+                    "Heures enregistrées : %sh pour %s",
+                    heures.heures, tache.numero
                 )
                 return Response(
-                    HeuresTravailSerializer(heures).data,
+                    serializer.data,
                     status=status.HTTP_201_CREATED
                 )
             return Response(
@@ -326,17 +547,37 @@ class TachesViewSet(viewsets.ModelViewSet):
     def photos(self, request, pk=None):
         """Lister les photos de la tâche."""
         tache = self.get_object()
-        photos = tache.photos.all().order_by('-date_photo')
-        serializer = PhotoRapportSerializer(photos, many=True)
-        return Response(serializer.data)
+        etag = self.get_etag_liste(tache, 'photos')
+        non_modifie = get_conditional_response(request, etag=etag)
+        if non_modifie is not None:
+            return non_modifie
+
+        # Ordre -date_photo du Meta
+        photos = tache.photos.select_related('uploadée_par', 'approuvee_par')
+        serializer = PhotoRapportSerializer(
+            photos, many=True, context=self.get_serializer_context()
+        )
+        return Response(serializer.data, headers={'ETag': etag})
 
     @action(detail=True, methods=['get'])
     def anomalies(self, request, pk=None):
         """Lister les anomalies de la tâche."""
         tache = self.get_object()
-        anomalies = tache.anomalies.all().order_by('-date_creation')
-        serializer = AnomalieSerializer(anomalies, many=True)
-        return Response(serializer.data)
+        etag = self.get_etag_liste(tache, 'anomalies')
+        non_modifie = get_conditional_response(request, etag=etag)
+        if non_modifie is not None:
+            return non_modifie
+
+        anomalies = AnomalieSerializer.setup_eager_loading(
+            tache.anomalies.select_related(
+                'signalee_par', 'responsable_correction'
+            ),
+            today=get_today(request)
+        )
+        serializer = AnomalieSerializer(
+            anomalies, many=True, context=self.get_serializer_context()
+        )
+        return Response(serializer.data, headers={'ETag': etag})
 
     @action(detail=True, methods=['post'])
     def signaler_anomalie(self, request, pk=None):
@@ -353,11 +594,11 @@ class TachesViewSet(viewsets.ModelViewSet):
                 signalee_par=request.user
             )
             logger.warning(
-                f"Anomalie signalée [{anomalie.severite}] : "
-                f"{anomalie.titre}"
+                "Anomalie signalée [%s] : %s",
+                anomalie.severite, anomalie.titre
             )
             return Response(
-                AnomalieSerializer(anomalie).data,
+                serializer.data,
                 status=status.HTTP_201_CREATED
             )
 
@@ -380,35 +621,103 @@ class HeuresTravailViewSet(viewsets.ModelViewSet):
 
     serializer_class = HeuresTravailSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = HeureTravailCursorPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['tache', 'membre', 'date', 'validee']
     ordering_fields = ['-date']
     ordering = ['-date']
 
+    def get_serializer_context(self):
+        """Date du jour calculée une seule fois pour toute la requête."""
+        context = super().get_serializer_context()
+        context['today'] = get_today(self.request)
+        return context
+
     def get_queryset(self):
-        """Optimiser les requêtes."""
-        return HeureTravail.objects.select_related(
-            'tache', 'membre', 'validee_par'
+        """
+        Optimiser les requêtes : la tâche imbriquée (tache_detail) est
+        préchargée avec ses propres annotations et relations.
+        """
+        taches = TacheSerializer.setup_eager_loading(Tache.objects.all())
+        # Listes : validateurs rendus une fois via user_map (une requête
+        # pour tous) ; valider renseigne validee_par lui-même
+        relations = ['membre']
+        if self.action in ('retrieve', 'update', 'partial_update'):
+            relations.append('validee_par')
+        queryset = HeureTravail.objects.select_related(*relations)
+        if self.action == 'valider':
+            # Chef du chantier comparé par id, sans charger lot/chantier/user
+            queryset = queryset.annotate(
+                _chef_id=F('tache__lot__chantier__chef_id')
+            )
+        if self.action == 'list':
+            taches = taches.only(*TacheSerializer.get_only_fields())
+            queryset = queryset.only(
+                *HeuresTravailSerializer.get_only_fields()
+            )
+        return queryset.prefetch_related(Prefetch('tache', queryset=taches))
+
+    def create(self, request, *args, **kwargs):
+        """
+        POST /api/v1/heures/ accepte aussi une liste d'entrées
+        (synchronisation mobile hors-ligne) ingérée en masse.
+        """
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+
+        heures = self._ingerer(request.data)
+        return Response(
+            HeuresTravailSerializer(heures, many=True).data,
+            status=status.HTTP_201_CREATED
         )
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        POST /api/v1/heures/bulk/ : même ingestion en masse, mais la
+        réponse ne contient que le nombre d'entrées créées (pas de
+        re-sérialisation ligne par ligne).
+        """
+        heures = self._ingerer(request.data)
+        return Response(
+            {'count': len(heures)},
+            status=status.HTTP_201_CREATED
+        )
+
+    def _ingerer(self, data):
+        """Valide une liste d'entrées puis l'enregistre via bulk_ingest."""
+        serializer = self.get_serializer(data=data, many=True)
+        serializer.is_valid(raise_exception=True)
+        heures = HeureTravail.bulk_ingest(
+            [HeureTravail(**entree) for entree in serializer.validated_data]
+        )
+        logger.info("Heures enregistrées en masse : %s entrées", len(heures))
+        return heures
+
     @action(detail=True, methods=['post'])
     def valider(self, request, pk=None):
         """Valider une entrée d'heures (Chef uniquement)."""
         heures = self.get_object()
 
         # Vérifier permission (chef du chantier)
-        chef = heures.tache.lot.chantier.chef
-        if request.user != chef and not request.user.is_staff:
+        if request.user.id != heures._chef_id and not request.user.is_staff:
             return Response(
                 {'detail': 'Vous n\'avez pas les permissions.'},
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        heures.validee = True
-        heures.validee_par = request.user
-        heures.save()
+        # UPDATE ciblé : HeureTravail.save() verrouillerait et relirait
+        # la ligne pour reporter un écart d'heures, nul ici
+        valeurs = {
+            'validee': True,
+            'validee_par': request.user,
+            'date_modification': timezone.now(),
+        }
+        HeureTravail.objects.filter(pk=heures.pk).update(**valeurs)
+        for champ, valeur in valeurs.items():
+            setattr(heures, champ, valeur)
 
-        logger.info(f"Heures validées : {heures.id}")
+        logger.info("Heures validées : %s", heures.id)
         return Response(
             HeuresTravailSerializer(heures).data,
             status=status.HTTP_200_OK
@@ -419,25 +728,19 @@ class HeuresTravailViewSet(viewsets.ModelViewSet):
         """Mes heures travaillées ce mois-ci."""
         membre = get_object_or_404(Membre, user=request.user)
 
-        from dateutil.relativedelta import relativedelta
+        # Intervalle semi-ouvert [1er du mois, 1er du mois suivant)
+        debut_mois, mois_suivant = get_bornes_mois(get_today(request))
 
-        debut_mois = timezone.now().replace(day=1)
-        fin_mois = (
-            debut_mois + relativedelta(months=1)
-            - relativedelta(days=1)
-        )
-
-        heures = HeureTravail.objects.filter(
+        # Même queryset que le listing (membre, tâche)
+        heures = self.get_queryset().filter(
             membre=membre,
             date__gte=debut_mois,
-            date__lte=fin_mois
+            date__lt=mois_suivant
         )
 
-        serializer = HeuresTravailSerializer(heures, many=True)
-        total = sum(
-            h['heures'] for h in serializer.data
-            if 'heures' in h
-        )
+        # Total calculé en SQL, pas sur les données sérialisées
+        total = heures.aggregate(total=Sum('heures'))['total'] or Decimal('0')
+        serializer = self.get_serializer(heures, many=True)
 
         return Response({
             'heures': serializer.data,
@@ -456,7 +759,9 @@ class EquipesViewSet(viewsets.ModelViewSet):
 
     queryset = Equipe.objects.filter(
         actif=True
-    ).prefetch_related('membres')
+    ).select_related('chef').annotate(
+        _membres_count=Count('membres', filter=Q(membres__actif=True))
+    )
     serializer_class = EquipeSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
@@ -464,6 +769,15 @@ class EquipesViewSet(viewsets.ModelViewSet):
     ordering_fields = ['nom']
     ordering = ['nom']
 
+    @action(detail=False, methods=['get'])
+    def lite(self, request):
+        """
+        Liste compacte pour les menus déroulants : id et nom, lus par
+        values() sans serializer (ni chef, ni comptage des membres).
+        """
+        equipes = self.filter_queryset(Equipe.objects.filter(actif=True))
+        return Response(list(equipes.values('id', 'nom')))
+
 
 # =================================================================
 # VIEWSET : MEMBRES
@@ -473,9 +787,6 @@ class EquipesViewSet(viewsets.ModelViewSet):
 class MembresViewSet(viewsets.ModelViewSet):
     """Gestion des membres d'équipe."""
 
-    queryset = Membre.objects.filter(
-        actif=True
-    ).select_related('equipe', 'user')
     serializer_class = MembreSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
@@ -483,6 +794,18 @@ class MembresViewSet(viewsets.ModelViewSet):
     search_fields = ['prenom', 'nom', 'email']
     ordering = ['nom', 'prenom']
 
+    def get_queryset(self):
+        """
+        Heures du mois annotées en une seule requête ; la liste ne lit que
+        les colonnes rendues (détail : modèle complet).
+        """
+        queryset = MembreSerializer.setup_eager_loading(
+            Membre.objects.filter(actif=True), today=get_today(self.request)
+        )
+        if self.action == 'list':
+            queryset = queryset.only(*MembreSerializer.get_only_fields())
+        return queryset
+
 
 # =================================================================
 # VIEWSET : SOUS-TRAITANTS
@@ -500,6 +823,16 @@ class SousTraitantsViewSet(viewsets.ModelViewSet):
     search_fields = ['nom_entreprise', 'nom_contact', 'email']
     ordering = ['nom_entreprise']
 
+    @action(detail=False, methods=['get'])
+    def lite(self, request):
+        """Liste compacte pour les menus déroulants (id, nom_entreprise)."""
+        sous_traitants = self.filter_queryset(self.get_queryset())
+        return Response(list(
+            sous_traitants.order_by(*self.ordering).values(
+                'id', 'nom_entreprise'
+            )
+        ))
+
 
 # =================================================================
 # VIEWSET : ANOMALIES
@@ -516,11 +849,26 @@ class AnomaliesViewSet(viewsets.ModelViewSet):
     ordering_fields = ['-date_creation']
     ordering = ['-date_creation']
 
+    def get_serializer_context(self):
+        """Date du jour calculée une seule fois pour toute la requête."""
+        context = super().get_serializer_context()
+        context['today'] = get_today(self.request)
+        return context
+
     def get_queryset(self):
-        """Optimiser les requêtes."""
-        return Anomalie.objects.select_related(
+        """
+        Optimiser les requêtes. Le flag de retard n'est annoté en SQL
+        qu'en lecture : après une écriture (assigner, fermer, update),
+        il est recalculé à partir des champs modifiés.
+        """
+        queryset = Anomalie.objects.select_related(
             'tache', 'signalee_par', 'responsable_correction'
         )
+        if self.action in ('list', 'retrieve'):
+            queryset = AnomalieSerializer.setup_eager_loading(
+                queryset, today=get_today(self.request)
+            )
+        return queryset
 
     @action(detail=True, methods=['post'])
     def assigner(self, request, pk=None):
@@ -528,36 +876,50 @@ class AnomaliesViewSet(viewsets.ModelViewSet):
         anomalie = self.get_object()
         responsable_id = request.data.get('responsable_id')
 
-        try:
-            responsable = User.objects.get(id=responsable_id)
-            anomalie.responsable_correction = responsable
-            anomalie.statut = 'EN_COURS'
-            anomalie.save()
-
-            logger.info(
-                f"Anomalie assignée : {anomalie.id} à {responsable}"
-            )
-            return Response(
-                AnomalieSerializer(anomalie).data,
-                status=status.HTTP_200_OK
-            )
-
-        except User.DoesNotExist:
+        # Seules les colonnes rendues dans responsable_detail
+        responsable = User.objects.only(
+            *UserSerializer.Meta.fields
+        ).filter(pk=responsable_id).first()
+        if responsable is None:
             return Response(
                 {'detail': 'Utilisateur non trouvé.'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
+        # update() ne déclenche pas auto_now : date_modification explicite
+        # (version du cache du rapport)
+        valeurs = {
+            'responsable_correction': responsable,
+            'statut': 'EN_COURS',
+            'date_modification': timezone.now(),
+        }
+        Anomalie.objects.filter(pk=anomalie.pk).update(**valeurs)
+        for champ, valeur in valeurs.items():
+            setattr(anomalie, champ, valeur)
+
+        logger.info(
+            "Anomalie assignée : %s à %s", anomalie.id, responsable.pk
+        )
+        return Response(
+            self.get_serializer(anomalie).data,
+            status=status.HTTP_200_OK
+        )
+
     @action(detail=True, methods=['post'])
     def fermer(self, request, pk=None):
         """Fermer une anomalie."""
         anomalie = self.get_object()
-        anomalie.statut = 'FERMEE'
-        anomalie.date_resolution_reelle = timezone.now().date()
-        anomalie.save()
+        valeurs = {
+            'statut': 'FERMEE',
+            'date_resolution_reelle': get_today(request),
+            'date_modification': timezone.now(),
+        }
+        Anomalie.objects.filter(pk=anomalie.pk).update(**valeurs)
+        for champ, valeur in valeurs.items():
+            setattr(anomalie, champ, valeur)
 
-        logger.info(f"Anomalie fermée : {anomalie.id}")
+        logger.info("Anomalie fermée : %s", anomalie.id)
         return Response(
-            AnomalieSerializer(anomalie).data,
+            self.get_serializer(anomalie).data,
             status=status.HTTP_200_OK
         )